@@ -1,7 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app.schemas.config import ConfigCreate, ConfigOut
-from app.services.config_service import get_configs, create_config, update_config
+from app.services.config_service import (
+    get_configs,
+    create_config,
+    update_config,
+    delete_config,
+)
 from app.core.db import get_db
 
 router = APIRouter()
@@ -51,8 +56,6 @@ def update_config_endpoint(
 def delete_config_endpoint(config_id: int, db: Session = Depends(get_db)):
     """Delete a configuration by ID"""
     try:
-        from app.services.config_service import delete_config
-
         deleted = delete_config(db, config_id)
         if not deleted:
             raise HTTPException(status_code=404, detail="Configuration not found")
@@ -1,14 +1,14 @@
 from fastapi import APIRouter, HTTPException
-from app.schemas.requests import DumpRequest
-from app.services.dump_service import run_dump
+from app.schemas.requests import DumpRequest, DumpBatchRequest
+from app.services.dump_service import run_dump_async, run_dumps_batch
 
 router = APIRouter()
 
 
 @router.post("/")
-def run_dump_endpoint(request: DumpRequest):
+async def run_dump_endpoint(request: DumpRequest):
     """Start database dump operation"""
-    result = run_dump(
+    result = await run_dump_async(
         request.db_type, request.params, request.config_name, request.dump_file_name
     )
 
@@ -20,3 +20,24 @@ def run_dump_endpoint(request: DumpRequest):
         }
     else:
         raise HTTPException(status_code=500, detail=result["message"])
+
+
+@router.post("/batch")
+async def run_dump_batch_endpoint(request: DumpBatchRequest):
+    """Start several database dump operations in parallel"""
+    results = await run_dumps_batch(
+        [job.dict() for job in request.jobs], request.max_workers
+    )
+
+    return {
+        "success": all(result["success"] for result in results),
+        "results": [
+            {
+                "config_name": job.config_name,
+                "success": result["success"],
+                "message": result["message"],
+                "path": result.get("path"),
+            }
+            for job, result in zip(request.jobs, results)
+        ],
+    }
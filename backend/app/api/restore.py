@@ -1,25 +1,14 @@
 from fastapi import APIRouter, HTTPException
-from app.schemas.requests import RestoreRequest
-from app.services.restore_service import run_restore
+from app.schemas.requests import RestoreRequest, RestoreBatchRequest
+from app.services.restore_service import run_restore_async, run_restores_batch
 
 router = APIRouter()
 
 
 @router.post("/")
-def run_restore_endpoint(request: RestoreRequest):
+async def run_restore_endpoint(request: RestoreRequest):
     """Start database restore operation"""
-    result = run_restore(
-        request.db_type,
-        request.params,
-        request.config_name,
-        request.restore_password,
-        request.local_database_name,
-        request.dump_file_name,
-        request.restore_username,
-        request.restore_host,
-        request.restore_port,
-        request.stack_name,
-    )
+    result = await run_restore_async(**request.dict())
 
     if result["success"]:
         return {
@@ -29,3 +18,24 @@ def run_restore_endpoint(request: RestoreRequest):
         }
     else:
         raise HTTPException(status_code=500, detail=result["message"])
+
+
+@router.post("/batch")
+async def run_restore_batch_endpoint(request: RestoreBatchRequest):
+    """Start several database restore operations in parallel"""
+    results = await run_restores_batch(
+        [job.dict() for job in request.jobs], request.max_workers
+    )
+
+    return {
+        "success": all(result["success"] for result in results),
+        "results": [
+            {
+                "config_name": job.config_name,
+                "success": result["success"],
+                "message": result["message"],
+                "path": result.get("path"),
+            }
+            for job, result in zip(request.jobs, results)
+        ],
+    }
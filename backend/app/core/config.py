@@ -48,5 +48,25 @@ class Settings:
         "RESTORE_BASE_PATH", "/home/Downloads/Database-dumps"
     )
 
+    # Maximum number of dump operations running at the same time
+    DUMP_CONCURRENCY: int = int(os.getenv("DUMP_CONCURRENCY", "4"))
+
+    # Maximum number of dumps of the same source database in one batch
+    DUMP_PER_SOURCE_CONCURRENCY: int = int(
+        os.getenv("DUMP_PER_SOURCE_CONCURRENCY", "1")
+    )
+
+    # Maximum number of dumps in one batch writing to the same volume
+    DUMP_WRITERS_PER_VOLUME: int = int(os.getenv("DUMP_WRITERS_PER_VOLUME", "4"))
+
+    # Seconds a dump client may run before it is killed (0 disables the limit)
+    DUMP_COMMAND_TIMEOUT: int = int(os.getenv("DUMP_COMMAND_TIMEOUT", "21600"))
+
+    # Maximum number of restore operations running at the same time
+    RESTORE_CONCURRENCY: int = int(os.getenv("RESTORE_CONCURRENCY", "4"))
+
+    # Seconds a restore client may run before it is killed (0 disables the limit)
+    RESTORE_COMMAND_TIMEOUT: int = int(os.getenv("RESTORE_COMMAND_TIMEOUT", "21600"))
+
 
 settings = Settings()
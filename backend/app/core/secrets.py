@@ -5,6 +5,7 @@ from typing import Optional, Dict, Any
 from cryptography.fernet import Fernet
 import base64
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +17,9 @@ except ImportError:
     AWS_AVAILABLE = False
     logger.warning("boto3 not available. AWS Secrets Manager integration disabled.")
 
+# Secrets written to AWS Secrets Manager at once by set_secrets
+AWS_SECRET_WORKERS = 4
+
 
 class SecretsManager:
     """Unified secrets management supporting multiple backends"""
@@ -90,6 +94,22 @@ class SecretsManager:
         else:
             return self._set_encrypted_env_secret(secret_name, secret_value)
     
+    def set_secrets(self, secrets: Dict[str, str], use_aws: bool = False) -> Dict[str, bool]:
+        """Store several secrets at once, returning whether each one was stored"""
+        if use_aws and self.aws_client:
+            # Each secret is its own API round trip; the shared client is
+            # thread-safe, so they run side by side over its connection pool
+            with ThreadPoolExecutor(max_workers=AWS_SECRET_WORKERS) as executor:
+                futures = {
+                    name: executor.submit(self._set_aws_secret, name, value)
+                    for name, value in secrets.items()
+                }
+                return {name: future.result() for name, future in futures.items()}
+        return {
+            name: self._set_encrypted_env_secret(name, value)
+            for name, value in secrets.items()
+        }
+    
     def _set_aws_secret(self, secret_name: str, secret_value: str) -> bool:
         """Store secret in AWS Secrets Manager"""
         try:
@@ -1,9 +1,24 @@
 import re
 import os
-from typing import Dict, Any, Optional
+import gzip
+import shutil
+import string
+import logging
+import threading
+from typing import Dict, Any, Optional, Tuple
 from pathlib import Path
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+    logger.warning("zstandard not available. Compressed dumps disabled.")
+
 # Database type configurations
 DB_CONFIGS = {
     "postgres": {"extension": ".sql", "image": "postgres:16", "default_port": 5432},
@@ -17,15 +32,58 @@ DB_CONFIGS = {
     },  # Use alpine for SQLite operations
 }
 
+# Supported compression codecs for dump files and their file suffixes
+COMPRESSION_EXTENSIONS = {"zstd": ".zst", "gzip": ".gz"}
+
+# Database types whose dump output is streamed through the backend and can
+# therefore be compressed inline
+COMPRESSIBLE_DB_TYPES = {"postgres", "mysql"}
+
+# pg_dump output formats; "custom" is pg_dump's compressed archive and
+# "directory" dumps tables in parallel into a folder
+POSTGRES_DUMP_FORMATS = ("plain", "custom", "directory")
+
+
+class _SafeFilenameTable(dict):
+    """str.translate table keeping [a-zA-Z0-9_-] and mapping anything else to '_'"""
+
+    def __missing__(self, key: int) -> str:
+        return "_"
+
+
+_SAFE_FILENAME_TABLE = _SafeFilenameTable(
+    (ord(c), c) for c in string.ascii_letters + string.digits + "_-"
+)
+_UNDERSCORE_RUNS = re.compile(r"_+")
+
 
 def sanitize_filename(filename: str) -> str:
     """Sanitize filename to be filesystem-safe"""
-    safe_name = re.sub(r"[^a-zA-Z0-9_-]", "_", filename)
-    return re.sub(r"_+", "_", safe_name).strip("_")
+    safe_name = filename.translate(_SAFE_FILENAME_TABLE)
+    return _UNDERSCORE_RUNS.sub("_", safe_name).strip("_")
+
+
+# Configured dump directory once it has been created and write-checked; a
+# fallback is never cached, so a mount missing at first use is retried
+_dump_directory: Optional[str] = None
+_dump_directory_lock = threading.Lock()
 
 
 def get_dump_directory() -> str:
-    """Get the dump directory path from configuration"""
+    """Get the dump directory path from configuration, resolving it only once"""
+    global _dump_directory
+    if _dump_directory is None:
+        with _dump_directory_lock:
+            if _dump_directory is None:
+                dump_dir, configured = _resolve_dump_directory()
+                if not configured:
+                    return dump_dir
+                _dump_directory = dump_dir
+    return _dump_directory
+
+
+def _resolve_dump_directory() -> Tuple[str, bool]:
+    """Create and write-check the dump directory, and say if it's the configured one"""
     try:
         # First try to use configured dump path if available
         try:
@@ -54,17 +112,15 @@ def get_dump_directory() -> str:
             home_dir = Path.home()
             dump_dir = home_dir / "Database-dumps"
             dump_dir.mkdir(parents=True, exist_ok=True)
+            return str(dump_dir), False
 
-        return str(dump_dir)
+        return str(dump_dir), True
     except Exception as e:
         # Fallback to /tmp if everything else fails
-        import logging
-
-        logger = logging.getLogger(__name__)
         logger.warning(
             f"Could not create dump directory in configured path, falling back to /tmp: {e}"
         )
-        return "/tmp"
+        return "/tmp", False
 
 
 def get_restore_directory() -> str:
@@ -90,9 +146,6 @@ def get_restore_directory() -> str:
         return str(restore_dir)
     except Exception as e:
         # Fallback to /tmp if everything else fails
-        import logging
-
-        logger = logging.getLogger(__name__)
         logger.warning(
             f"Could not create restore directory in configured path, falling back to /tmp: {e}"
         )
@@ -100,14 +153,26 @@ def get_restore_directory() -> str:
 
 
 def get_consistent_path(
-    config_name: str, db_type: str, dump_file_name: Optional[str] = None
+    config_name: str,
+    db_type: str,
+    dump_file_name: Optional[str] = None,
+    compression: Optional[str] = None,
+    dump_dir: Optional[str] = None,
+    dump_format: Optional[str] = None,
 ) -> str:
     """Generate consistent file path for dump/restore operations"""
     filename = sanitize_filename(dump_file_name or config_name)
-    extension = DB_CONFIGS.get(db_type, {}).get("extension", ".dump")
-
-    # Use the configured dump directory
-    dump_dir = get_dump_directory()
+    if dump_format == "directory":
+        # Directory-format dumps are a folder named after the dump
+        extension = ""
+    elif dump_format == "custom":
+        extension = ".dump"
+    else:
+        extension = DB_CONFIGS.get(db_type, {}).get("extension", ".dump")
+        extension += COMPRESSION_EXTENSIONS.get(compression, "")
+
+    # Use the configured dump directory unless the caller already resolved it
+    dump_dir = dump_dir or get_dump_directory()
 
     return os.path.join(dump_dir, f"{filename}{extension}")
 
@@ -123,6 +188,105 @@ def get_restore_path(file_path: str) -> str:
     return os.path.join(restore_dir, file_path)
 
 
+def get_dump_compression(db_type: str, params: Dict[str, Any]) -> Optional[str]:
+    """Get the compression codec requested for a dump, if applicable"""
+    if db_type not in COMPRESSIBLE_DB_TYPES:
+        return None
+    return params.get("compression")
+
+
+def get_dump_format(db_type: str, params: Dict[str, Any]) -> Optional[str]:
+    """Get the pg_dump output format requested for a dump, if applicable"""
+    if db_type != "postgres":
+        return None
+    return params.get("dump_format")
+
+
+def get_parallel_jobs(params: Dict[str, Any]) -> int:
+    """Get the number of parallel workers for directory-format dumps/restores"""
+    return int(params.get("parallel_jobs") or min(4, os.cpu_count() or 1))
+
+
+def advise_sequential(fd: int) -> None:
+    """Tell the kernel an open file is read front to back, widening read-ahead"""
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
+
+
+def advise_dontneed(fd: int) -> None:
+    """Tell the kernel an open file's cached pages won't be read again"""
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        except OSError:
+            pass
+
+
+def decompress_stream(source: str, src: Any, dst: Any) -> None:
+    """Stream-decompress an open zstd or gzip compressed dump into dst"""
+    if source.endswith(COMPRESSION_EXTENSIONS["gzip"]):
+        with gzip.GzipFile(fileobj=src, mode="rb") as reader:
+            shutil.copyfileobj(reader, dst, 1 << 20)
+        return
+
+    if not ZSTD_AVAILABLE:
+        raise RuntimeError("zstandard is required to restore compressed dumps")
+
+    dctx = zstandard.ZstdDecompressor()
+    dctx.copy_stream(src, dst, read_size=1 << 20, write_size=1 << 20)
+
+
+def copy_file(source: str, target: str, copy_metadata: bool = True) -> None:
+    """Copy a file in-kernel, preserving its metadata unless told not to.
+
+    copy_file_range lets the filesystem reflink or copy server-side where it
+    can; sendfile (page cache to page cache) is used when the kernel or
+    filesystem pair doesn't support it, and a buffered copy as a last resort.
+    """
+    src = os.open(source, os.O_RDONLY)
+    try:
+        advise_sequential(src)
+        dst = os.open(target, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            method = "copy_file_range" if hasattr(os, "copy_file_range") else "sendfile"
+            offset = 0
+            # Copy until EOF rather than to the size seen up front, so a file
+            # that grows meanwhile is copied in full
+            while True:
+                try:
+                    if method == "copy_file_range":
+                        count = os.copy_file_range(src, dst, 1 << 30, offset, offset)
+                    elif method == "sendfile":
+                        count = os.sendfile(dst, src, offset, 1 << 30)
+                    else:
+                        os.lseek(src, offset, os.SEEK_SET)
+                        with open(src, "rb", closefd=False) as fsrc, open(
+                            dst, "wb", closefd=False
+                        ) as fdst:
+                            shutil.copyfileobj(fsrc, fdst, 4 << 20)
+                        break
+                except OSError:
+                    if method == "copy":
+                        raise
+                    # e.g. EXDEV/EINVAL: this filesystem pair doesn't support
+                    # it, so continue from the same offset the next way down
+                    method = "sendfile" if method == "copy_file_range" else "copy"
+                    os.lseek(dst, offset, os.SEEK_SET)
+                    continue
+                if count == 0:
+                    break
+                offset += count
+        finally:
+            os.close(dst)
+    finally:
+        os.close(src)
+    if copy_metadata:
+        shutil.copystat(source, target)
+
+
 def validate_db_type(db_type: str) -> bool:
     """Validate if database type is supported"""
     return db_type in DB_CONFIGS
@@ -5,6 +5,21 @@ import ipaddress
 import os
 from urllib.parse import urlparse
 
+# Patterns used by the validators below, compiled once at import
+_SQL_INJECTION_RE = re.compile(
+    "|".join([
+        r"union\s+select", r"drop\s+table", r"delete\s+from",
+        r"insert\s+into", r"update\s+set", r"exec\s*\(",
+        r"xp_cmdshell", r"sp_executesql", r"--", r"/\*", r"\*/"
+    ])
+)
+_HOSTNAME_RE = re.compile(
+    r"^[a-zA-Z0-9]([a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?(\.[a-zA-Z0-9]([a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?)*$"
+)
+_DATABASE_NAME_RE = re.compile(r"^[a-zA-Z0-9_-]+$")
+_S3_URI_RE = re.compile(r'^s3://[a-z0-9][a-z0-9.-]{1,61}[a-z0-9](/.*)?$')
+_TABLE_NAME_RE = re.compile(r"^[a-zA-Z0-9_.]+$")
+
 
 def validate_string_length(value: str, min_length: int = 1, max_length: int = 255) -> str:
     """Validate string length within bounds"""
@@ -42,15 +57,8 @@ def validate_no_path_traversal(value: str) -> str:
 
 def validate_no_sql_injection(value: str) -> str:
     """Basic SQL injection prevention"""
-    sql_patterns = [
-        r"union\s+select", r"drop\s+table", r"delete\s+from", 
-        r"insert\s+into", r"update\s+set", r"exec\s*\(",
-        r"xp_cmdshell", r"sp_executesql", r"--", r"/\*", r"\*/"
-    ]
-    
-    for pattern in sql_patterns:
-        if re.search(pattern, value.lower()):
-            raise ValueError("Potentially dangerous SQL patterns detected")
+    if _SQL_INJECTION_RE.search(value.lower()):
+        raise ValueError("Potentially dangerous SQL patterns detected")
     
     return value
 
@@ -68,8 +76,7 @@ def validate_hostname_or_ip(value: str) -> str:
         pass
     
     # Check if it's a valid hostname
-    hostname_pattern = r"^[a-zA-Z0-9]([a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?(\.[a-zA-Z0-9]([a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?)*$"
-    if not re.match(hostname_pattern, value):
+    if not _HOSTNAME_RE.match(value):
         raise ValueError("Invalid hostname or IP address format")
     
     if len(value) > 253:
@@ -106,7 +113,7 @@ def validate_database_name(value: str) -> str:
         raise ValueError("Database name too long (max 64 characters)")
     
     # Allow alphanumeric, underscore, and hyphen
-    if not re.match(r"^[a-zA-Z0-9_-]+$", value):
+    if not _DATABASE_NAME_RE.match(value):
         raise ValueError("Database name can only contain letters, numbers, underscores, and hyphens")
     
     return value
@@ -134,6 +141,44 @@ def validate_db_params(db_type: str, params: Dict[str, Any]) -> Dict[str, Any]:
     if "database" in params and params["database"]:
         params["database"] = validate_database_name(str(params["database"]))
     
+    if "compression" in params and params["compression"]:
+        if params["compression"] not in ("zstd", "gzip"):
+            raise ValueError("Compression must be one of: ['zstd', 'gzip']")
+    
+    if "dump_format" in params and params["dump_format"]:
+        if params["dump_format"] not in ("plain", "custom", "directory"):
+            raise ValueError("Dump format must be one of: ['plain', 'custom', 'directory']")
+        if params["dump_format"] != "plain" and params.get("compression"):
+            raise ValueError("Custom and directory dumps are compressed by pg_dump and cannot use compression")
+    
+    if "destination" in params and params["destination"]:
+        destination = str(params["destination"])
+        if not _S3_URI_RE.match(destination):
+            raise ValueError("Destination must be an S3 URI like s3://bucket/prefix")
+        if db_type not in ("postgres", "mysql") or params.get("dump_format") == "directory":
+            raise ValueError("Only plain PostgreSQL and MySQL dumps can be streamed to S3")
+        params["destination"] = destination
+    
+    if "parallel_jobs" in params and params["parallel_jobs"]:
+        try:
+            parallel_jobs = int(params["parallel_jobs"])
+        except (TypeError, ValueError):
+            raise ValueError("Parallel jobs must be a number")
+        if not 1 <= parallel_jobs <= 64:
+            raise ValueError("Parallel jobs must be between 1 and 64")
+        params["parallel_jobs"] = parallel_jobs
+    
+    if "prewarm_tables" in params and params["prewarm_tables"]:
+        tables = params["prewarm_tables"]
+        if isinstance(tables, str):
+            tables = [table.strip() for table in tables.split(",") if table.strip()]
+        if db_type != "postgres" or not isinstance(tables, list):
+            raise ValueError("Prewarm tables must be a list of PostgreSQL table names")
+        for table in tables:
+            if not _TABLE_NAME_RE.match(str(table)):
+                raise ValueError(f"Invalid table name to prewarm: {table}")
+        params["prewarm_tables"] = [str(table) for table in tables]
+    
     # Type-specific validations
     if db_type == "postgres":
         required_fields = ["host", "port", "username"]
@@ -156,6 +201,10 @@ def validate_db_params(db_type: str, params: Dict[str, Any]) -> Dict[str, Any]:
     return params
 
 
+# Characters replaced by sanitize_filename, as a single-pass translate table
+_UNSAFE_FILENAME_TABLE = str.maketrans({char: "_" for char in '<>:"/\\|?*'})
+
+
 def sanitize_filename(filename: str) -> str:
     """Sanitize filename to prevent security issues"""
     if not filename:
@@ -165,7 +214,7 @@ def sanitize_filename(filename: str) -> str:
     filename = os.path.basename(filename)
     
     # Remove dangerous characters
-    filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
+    filename = filename.translate(_UNSAFE_FILENAME_TABLE)
     
     # Limit length
     if len(filename) > 255:
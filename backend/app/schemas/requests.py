@@ -1,10 +1,11 @@
 from pydantic import BaseModel, Field, validator
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from app.core.validators import (
     validate_string_length,
     validate_alphanumeric_with_special,
     validate_no_path_traversal,
     validate_db_params,
+    validate_database_name,
     sanitize_filename
 )
 
@@ -67,6 +68,17 @@ class DumpRequest(BaseModel):
         return v
 
 
+class DumpBatchRequest(BaseModel):
+    """Request schema for running several dump operations together"""
+
+    jobs: List[DumpRequest] = Field(
+        ..., min_length=1, description="Dump operations to run in parallel"
+    )
+    max_workers: Optional[int] = Field(
+        default=None, ge=1, le=64, description="Maximum dumps of this batch running at once"
+    )
+
+
 class RestoreRequest(BaseModel):
     """Request schema for database restore operation
     Note: The 'database' field in params is now optional for all db types."""
@@ -102,6 +114,16 @@ class RestoreRequest(BaseModel):
         default=None,
         description="Optional Docker Compose stack name for containerized restore operations",
     )
+    restore_jobs: Optional[int] = Field(
+        default=None,
+        ge=1,
+        le=64,
+        description="Optional pg_restore worker count for custom/directory PostgreSQL dumps",
+    )
+    reset_mode: Optional[str] = Field(
+        default=None,
+        description="How a PostgreSQL target is reset before restoring: drop (default), truncate or skip",
+    )
 
     _validate_db_type = validator("db_type", allow_reuse=True)(validate_db_type)
     _validate_config_name = validator("config_name", allow_reuse=True)(
@@ -125,6 +147,13 @@ class RestoreRequest(BaseModel):
             validate_no_path_traversal(v)
         return v
     
+    @validator("reset_mode")
+    def validate_reset_mode(cls, v):
+        """Validate PostgreSQL reset mode"""
+        if v and v not in ("drop", "truncate", "skip"):
+            raise ValueError("Reset mode must be one of: drop, truncate, skip")
+        return v
+
     @validator("restore_password")
     def validate_restore_password(cls, v):
         """Validate restore password"""
@@ -136,6 +165,16 @@ class RestoreRequest(BaseModel):
     def validate_local_db_name(cls, v):
         """Validate local database name"""
         if v:
-            from app.core.validators import validate_database_name
             v = validate_database_name(str(v))
         return v
+
+
+class RestoreBatchRequest(BaseModel):
+    """Request schema for running several restore operations together"""
+
+    jobs: List[RestoreRequest] = Field(
+        ..., min_length=1, description="Restore operations to run in parallel"
+    )
+    max_workers: Optional[int] = Field(
+        default=None, ge=1, le=64, description="Maximum restores of this batch running at once"
+    )
@@ -1,4 +1,5 @@
 import os
+import re
 import subprocess
 import logging
 import json
@@ -13,6 +14,8 @@ from app.schemas.docker_compose import (
 
 logger = logging.getLogger(__name__)
 
+_POSTGRES_IMAGE_VERSION_RE = re.compile(r"postgres:(\d+)")
+
 
 def get_docker_compose_configs(db: Session) -> List[DockerComposeConfig]:
     """Get all Docker Compose configurations from database"""
@@ -388,9 +391,7 @@ def get_stack_database_info(stack_name: str) -> Dict[str, Any]:
         # Extract PostgreSQL version from image
         postgres_version = None
         if db_container["db_type"] == "postgres":
-            import re
-
-            version_match = re.search(r"postgres:(\d+)", db_container["image"])
+            version_match = _POSTGRES_IMAGE_VERSION_RE.search(db_container["image"])
             if version_match:
                 postgres_version = version_match.group(1)
 
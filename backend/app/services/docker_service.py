@@ -1,22 +1,39 @@
+import atexit
 import docker
 from docker.errors import DockerException
 import logging
-from typing import Dict, Any
+import threading
+from typing import Dict, Any, Optional
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Shared Docker client, created on first use and reused across requests
+_docker_client: Optional[docker.DockerClient] = None
+_docker_client_lock = threading.Lock()
+
+
+def _get_shared_client() -> docker.DockerClient:
+    """Create the shared Docker client once and return it"""
+    global _docker_client
+    if _docker_client is None:
+        with _docker_client_lock:
+            if _docker_client is None:
+                _docker_client = docker.from_env(
+                    environment={"DOCKER_HOST": settings.DOCKER_HOST}
+                )
+                # Release the daemon connection pool when the process exits
+                atexit.register(_docker_client.close)
+    return _docker_client
+
 
 def get_docker_status() -> Dict[str, Any]:
     """Get current Docker daemon status"""
     try:
-        # Try to connect to Docker daemon using configured host
-        client = docker.from_env(environment={"DOCKER_HOST": settings.DOCKER_HOST})
-        client.ping()
-
-        # Get additional Docker info
+        # One info call both proves the daemon is reachable and carries its
+        # version, so no separate ping/version round trips are needed
+        client = _get_shared_client()
         info = client.info()
-        version = client.version()
 
         return {
             "success": True,
@@ -25,7 +42,7 @@ def get_docker_status() -> Dict[str, Any]:
             "info": {
                 "containers": info.get("Containers", 0),
                 "images": info.get("Images", 0),
-                "version": version.get("Version", "Unknown"),
+                "version": info.get("ServerVersion", "Unknown"),
                 "os": info.get("OperatingSystem", "Unknown"),
                 "architecture": info.get("Architecture", "Unknown"),
             },
@@ -49,9 +66,9 @@ def get_docker_status() -> Dict[str, Any]:
 
 
 def get_docker_client():
-    """Get Docker client instance"""
+    """Get shared Docker client instance"""
     try:
-        return docker.from_env(environment={"DOCKER_HOST": settings.DOCKER_HOST})
+        return _get_shared_client()
     except DockerException as e:
         logger.error(f"Failed to connect to Docker: {e}")
         raise Exception("Docker daemon is not running")
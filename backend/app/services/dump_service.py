@@ -1,23 +1,88 @@
 import os
+import asyncio
 import logging
 import subprocess
 import shlex
-from typing import Dict, Any, Optional
+import shutil
+import sqlite3
+import tempfile
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Any, List, Optional
+from app.core.config import settings
 from app.core.utils import (
     get_consistent_path,
     validate_db_type,
     format_error_response,
     format_success_response,
     get_dump_directory,
+    get_dump_compression,
+    get_dump_format,
+    get_parallel_jobs,
+    copy_file,
+    ZSTD_AVAILABLE,
 )
+from app.services.host_command import (
+    build_env,
+    kill_process_groups,
+    run_host_command,
+    timeout_message,
+    write_mysql_option_file,
+)
+from app.services.object_storage import AWS_AVAILABLE, is_s3_uri, open_dump_output
 
 logger = logging.getLogger(__name__)
 
+if ZSTD_AVAILABLE:
+    import zstandard
+
+# Client binary each dump type shells out to, located once at import
+_DUMP_BINARIES = {
+    "postgres": "pg_dump",
+    "mysql": "mysqldump",
+    "mongodb": "mongodump",
+    "redis": "redis-cli",
+}
+_HOST_BINARIES = {
+    db_type: shutil.which(binary) for db_type, binary in _DUMP_BINARIES.items()
+}
+
+# gzip compressor for dumps: parallel pigz when installed, fast gzip otherwise
+_GZIP_COMMAND = (
+    ["pigz", "-p", str(os.cpu_count() or 1)]
+    if shutil.which("pigz")
+    else ["gzip", "-1"]
+)
+
+# Limits concurrent dumps dispatched through run_dump_async
+_dump_semaphore = asyncio.Semaphore(settings.DUMP_CONCURRENCY)
+
+# Dedicated worker threads for dumps, so long-running dumps never occupy the
+# event loop's default executor used for short blocking calls
+_dump_executor = ThreadPoolExecutor(
+    max_workers=settings.DUMP_CONCURRENCY, thread_name_prefix="dump"
+)
+
+# Seconds a dump client may run before it is killed (None = no limit)
+COMMAND_TIMEOUT = settings.DUMP_COMMAND_TIMEOUT or None
+
+# Trailing bytes of a dump client's stderr kept for error messages
+_STDERR_TAIL_BYTES = 8192
+
+# Dump directories already created and write-checked by this process
+_ENSURED_DIRS: set = set()
+_ENSURED_LOCK = threading.Lock()
+
 
-def ensure_dump_directory_exists():
+def ensure_dump_directory_exists(dump_dir: Optional[str] = None):
     """Ensure the dump directory exists and is writable"""
     try:
-        dump_dir = get_dump_directory()
+        dump_dir = dump_dir or get_dump_directory()
+        if dump_dir in _ENSURED_DIRS:
+            return True
+
         os.makedirs(dump_dir, exist_ok=True)
 
         # Test write access
@@ -26,10 +91,12 @@ def ensure_dump_directory_exists():
             f.write("test")
         os.remove(test_file)
 
-        logger.info(f"Dump directory is ready: {dump_dir}")
+        with _ENSURED_LOCK:
+            _ENSURED_DIRS.add(dump_dir)
+        logger.info("Dump directory is ready: %s", dump_dir)
         return True
     except Exception as e:
-        logger.error(f"Failed to ensure dump directory exists: {e}")
+        logger.error("Failed to ensure dump directory exists: %s", e)
         return False
 
 
@@ -44,63 +111,308 @@ def run_dump(
         if not validate_db_type(db_type):
             return format_error_response(f"Unsupported database type: {db_type}")
 
-        # Ensure dump directory exists
-        if not ensure_dump_directory_exists():
+        # Resolve the dump directory once and reuse it for every step below
+        dump_dir = get_dump_directory()
+        if not ensure_dump_directory_exists(dump_dir):
             return format_error_response("Failed to create or access dump directory")
 
-        path = get_consistent_path(config_name, db_type, dump_file_name)
-        dump_dir = get_dump_directory()
-        logger.info(f"Dump directory: {dump_dir}")
+        compression = get_dump_compression(db_type, params)
+        if compression == "zstd" and not ZSTD_AVAILABLE:
+            return format_error_response(
+                "Compressed dumps require the zstandard package to be installed"
+            )
+
+        path = get_consistent_path(
+            config_name,
+            db_type,
+            dump_file_name,
+            compression,
+            dump_dir=dump_dir,
+            dump_format=get_dump_format(db_type, params),
+        )
+
+        # Stream straight to object storage instead of the dump directory
+        destination = params.get("destination")
+        if destination:
+            if not AWS_AVAILABLE:
+                return format_error_response(
+                    "Dumps to S3 require the boto3 package to be installed"
+                )
+            path = f"{destination.rstrip('/')}/{os.path.basename(path)}"
+
+        logger.info("Dump directory: %s", dump_dir)
         logger.info(
-            f"Starting {db_type} dump operation for config '{config_name}' to path: {path}"
+            "Starting %s dump operation for config '%s' to path: %s",
+            db_type,
+            config_name,
+            path,
         )
 
-        dump_functions = {
-            "postgres": _dump_postgres,
-            "mysql": _dump_mysql,
-            "mongodb": _dump_mongodb,
-            "redis": _dump_redis,
-            "sqlite": _dump_sqlite,
-        }
+        handler = _DUMP_FUNCTIONS.get(db_type)
+        if handler is None:
+            return format_error_response(f"Unsupported database type: {db_type}")
+
+        if db_type in _DUMP_BINARIES and not _HOST_BINARIES[db_type]:
+            return format_error_response(
+                f"{_DUMP_BINARIES[db_type]} is not installed on the host. "
+                f"Please install it to run {db_type} dumps."
+            )
 
-        return dump_functions[db_type](params, path)
+        return handler(params, path)
     except Exception as e:
-        logger.error(f"Dump operation failed: {e}")
+        logger.error("Dump operation failed: %s", e)
         return format_error_response(f"Dump operation failed: {str(e)}")
 
 
-def _run_host_command(
-    cmd: str, env: Optional[Dict[str, str]] = None
-) -> subprocess.CompletedProcess:
-    """Run a command on the host system"""
-    try:
-        # Parse command safely
-        args = shlex.split(cmd)
-
-        # Set up environment
-        process_env = os.environ.copy()
-        if env:
-            process_env.update(env)
-
-        logger.info(f"Running host command: {cmd}")
-        result = subprocess.run(
-            args,
-            env=process_env,
-            capture_output=True,
-            text=True,
+async def run_dump_async(
+    db_type: str,
+    params: Dict[str, Any],
+    config_name: str,
+    dump_file_name: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Run database dump operation without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    async with _dump_semaphore:
+        return await loop.run_in_executor(
+            _dump_executor, run_dump, db_type, params, config_name, dump_file_name
         )
 
-        if result.returncode != 0:
-            logger.error(f"Command failed with return code {result.returncode}")
-            logger.error(f"stdout: {result.stdout}")
-            logger.error(f"stderr: {result.stderr}")
 
-        return result
+async def run_dumps_batch(
+    jobs: List[Dict[str, Any]], max_workers: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Run several dump operations in parallel and flush their files together"""
+    batch_semaphore = asyncio.Semaphore(max_workers or len(jobs))
+
+    # Jobs hitting the same source database, or writing to the same volume,
+    # share a semaphore so neither is hammered by every dump in the batch
+    semaphores: Dict[tuple, asyncio.Semaphore] = {}
+
+    def limit(key: tuple, size: int) -> asyncio.Semaphore:
+        if key not in semaphores:
+            semaphores[key] = asyncio.Semaphore(size)
+        return semaphores[key]
+
+    async def run_job(job: Dict[str, Any]) -> Dict[str, Any]:
+        source = limit(
+            _dump_source_key(job["db_type"], job["params"]),
+            settings.DUMP_PER_SOURCE_CONCURRENCY,
+        )
+        target = limit(
+            _dump_target_key(job["params"]), settings.DUMP_WRITERS_PER_VOLUME
+        )
+        # Always acquired in the same order, so jobs can't deadlock
+        async with batch_semaphore, source, target:
+            return await run_dump_async(**job)
+
+    results = await asyncio.gather(*(run_job(job) for job in jobs))
+
+    # Flush every finished dump (and the directories holding them) in one
+    # concurrent batch instead of paying for each fsync serially
+    dump_paths = {
+        result["path"]
+        for result in results
+        if result.get("path") and not is_s3_uri(result["path"])
+    }
+    paths = set(dump_paths)
+    for path in dump_paths:
+        paths.add(os.path.dirname(path))
+        if os.path.isdir(path):
+            # Directory-format dumps hold one file per table plus a TOC
+            paths.update(entry.path for entry in os.scandir(path) if entry.is_file())
+    await asyncio.gather(*(asyncio.to_thread(_fsync_path, path) for path in paths))
+
+    return list(results)
+
+
+def _dump_source_key(db_type: str, params: Dict[str, Any]) -> tuple:
+    """Identify the database server (or SQLite file) a dump reads from"""
+    if db_type == "sqlite":
+        return (db_type, params.get("database"))
+    return (db_type, params.get("host"), params.get("port"))
+
+
+def _dump_target_key(params: Dict[str, Any]) -> tuple:
+    """Identify the volume (local dump directory or S3 bucket) a dump writes to"""
+    destination = params.get("destination")
+    if destination:
+        return ("s3", destination[len("s3://") :].split("/", 1)[0])
+    return ("local",)
+
+
+def _fsync_path(path: str) -> None:
+    """Flush a dump file or directory to stable storage"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    except OSError as e:
+        logger.warning("Failed to fsync %s: %s", path, e)
+
+
+def _run_host_command_to_file(
+    args: List[str],
+    path: str,
+    env: Optional[Dict[str, str]] = None,
+    compression: Optional[str] = None,
+) -> subprocess.CompletedProcess:
+    """Run a command on the host system, streaming its stdout into a file.
+
+    With compression="zstd" the output is compressed in-process while the
+    command is still producing it, and with compression="gzip" it is piped
+    through pigz/gzip, so the dump is written to disk only once. An s3://
+    path streams the output straight into an S3 upload instead of a file.
+    """
+    # A local dump is written under a temporary name and only renamed over
+    # path once it is complete, so a failed dump never clobbers the last one
+    partial = None if is_s3_uri(path) else _partial_path(path)
+    try:
+        process_env = build_env(env)
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Running host command: %s", shlex.join(args))
+        # stderr goes to a temp file so a chatty command can't fill the pipe
+        # and deadlock against the stdout reader
+        with open_dump_output(partial or path) as out, tempfile.TemporaryFile() as err:
+            # Output is relayed through Python only when it has to be
+            # compressed in-process or uploaded
+            relayed = compression == "zstd" or is_s3_uri(path)
+            stdout = subprocess.PIPE if relayed else out
+
+            # Each process gets its own session so a timeout can take down
+            # anything it spawned too
+            compressor = None
+            if compression == "gzip":
+                # Compress on other cores while the dump is still running
+                proc = subprocess.Popen(
+                    args,
+                    env=process_env,
+                    stdout=subprocess.PIPE,
+                    stderr=err,
+                    start_new_session=True,
+                )
+                compressor = subprocess.Popen(
+                    _GZIP_COMMAND,
+                    stdin=proc.stdout,
+                    stdout=stdout,
+                    stderr=err,
+                    start_new_session=True,
+                )
+                # Leave the compressor as the pipe's only reader so the dump
+                # gets SIGPIPE if it exits early
+                proc.stdout.close()
+                producer = compressor
+                procs = [proc, compressor]
+            else:
+                proc = subprocess.Popen(
+                    args,
+                    env=process_env,
+                    stdout=stdout,
+                    stderr=err,
+                    start_new_session=True,
+                )
+                producer = proc
+                procs = [proc]
+
+            # Output may be relayed below, so the timeout is enforced by a
+            # watchdog rather than by wait()
+            timed_out = threading.Event()
+            watchdog = None
+            if COMMAND_TIMEOUT:
+                watchdog = threading.Timer(
+                    COMMAND_TIMEOUT,
+                    kill_process_groups,
+                    (procs, timed_out, COMMAND_TIMEOUT),
+                )
+                watchdog.daemon = True
+                watchdog.start()
+
+            if relayed:
+                try:
+                    if compression == "zstd":
+                        zstd_params = zstandard.ZstdCompressionParameters.from_level(
+                            3, window_log=27, enable_ldm=True, threads=-1
+                        )
+                        cctx = zstandard.ZstdCompressor(compression_params=zstd_params)
+                        cctx.copy_stream(producer.stdout, out, read_size=1 << 20)
+                    else:
+                        shutil.copyfileobj(producer.stdout, out, 1 << 20)
+                except Exception:
+                    # e.g. a full disk or a failed upload: stop the dump
+                    # rather than leave it blocked on a pipe nobody reads
+                    kill_process_groups(procs, timed_out)
+                    for process in procs:
+                        process.wait()
+                    if watchdog is not None:
+                        watchdog.cancel()
+                    raise
+                producer.stdout.close()
+
+            returncode = proc.wait()
+            if compressor is not None and compressor.wait() != 0 and returncode == 0:
+                returncode = compressor.returncode
+            if watchdog is not None:
+                watchdog.cancel()
+
+            if returncode != 0 and is_s3_uri(path):
+                # Don't publish a truncated dump to the bucket
+                out.abort()
+
+            # Only the tail of stderr is kept for error reporting
+            err.seek(max(0, err.seek(0, os.SEEK_END) - _STDERR_TAIL_BYTES))
+            stderr = err.read().decode("utf-8", errors="replace")
+            if timed_out.is_set():
+                stderr += timeout_message(COMMAND_TIMEOUT)
+
+        if partial:
+            _finish_partial(partial, path, returncode == 0)
+
+        if returncode != 0:
+            logger.error("Command failed with return code %s", returncode)
+            logger.error("stderr: %s", stderr)
+
+        return subprocess.CompletedProcess(args, returncode, stdout=None, stderr=stderr)
     except Exception as e:
-        logger.error(f"Failed to run command: {e}")
+        logger.error("Failed to run command: %s", e)
+        if partial:
+            _remove_partial(partial)
         raise
 
 
+def _partial_path(path: str) -> str:
+    """Get a unique hidden sibling of path to write an in-progress dump to"""
+    directory, name = os.path.split(path)
+    return os.path.join(directory, f".{name}.{uuid.uuid4().hex[:12]}.partial")
+
+
+def _finish_partial(partial: str, path: str, succeeded: bool) -> None:
+    """Move a completed dump into place, or discard a failed one"""
+    if not succeeded:
+        _remove_partial(partial)
+    elif os.path.isdir(partial) and os.path.isdir(path):
+        # A directory can't be renamed over a non-empty one, so the previous
+        # dump is moved aside and only deleted once the new one is in place
+        previous = _partial_path(path)
+        os.rename(path, previous)
+        os.rename(partial, path)
+        _remove_partial(previous)
+    else:
+        os.replace(partial, path)
+
+
+def _remove_partial(partial: str) -> None:
+    """Delete an unfinished dump file or directory, if anything was written yet"""
+    if os.path.isdir(partial):
+        shutil.rmtree(partial, ignore_errors=True)
+        return
+    try:
+        os.unlink(partial)
+    except FileNotFoundError:
+        pass
+
+
 def _dump_postgres(params: Dict[str, Any], path: str) -> Dict[str, Any]:
     """Dump PostgreSQL database using host pg_dump"""
     try:
@@ -120,34 +432,67 @@ def _dump_postgres(params: Dict[str, Any], path: str) -> Dict[str, Any]:
             return format_error_response(error_msg)
 
         logger.info(
-            f"PostgreSQL dump: {host}:{port}, database: {database}, user: {username}"
+            "PostgreSQL dump: %s:%s, database: %s, user: %s",
+            host,
+            port,
+            database,
+            username,
         )
 
+        # Set environment for password
+        env = {"PGPASSWORD": password}
+
         # Build pg_dump command
-        cmd = f"pg_dump -h {host} -p {port} -U {username} -d {database}"
+        cmd = ["pg_dump", "-h", host, "-p", port, "-U", username, "-d", database]
 
         # Add format options for better compatibility
-        if path.endswith(".sql"):
-            cmd += " --clean --if-exists"
+        dump_format = params.get("dump_format") or "plain"
+        if dump_format == "directory":
+            # Dump tables with parallel workers into a compressed directory.
+            # Each worker dumps whole tables, so more workers than tables
+            # would only open idle connections
+            jobs = get_parallel_jobs(params)
+            table_count = _postgres_table_count(host, port, username, database, env)
+            if table_count is not None:
+                jobs = max(1, min(jobs, table_count))
+            cmd += ["-Fd", "-j", str(jobs), "-Z", "3"]
+        elif dump_format == "custom":
+            # Compressed archive for pg_restore; level 3 like directory dumps,
+            # so the dump isn't bound by compression CPU
+            cmd += ["-Fc", "-Z", "3"]
         else:
-            cmd += " -Fc"  # Custom format for .dump files
+            cmd += ["--clean", "--if-exists"]
 
         # Add exclude table if specified
         if params.get("exclude_table"):
-            cmd += f" --exclude-table {params['exclude_table']}"
+            cmd += ["--exclude-table", params["exclude_table"]]
 
-        # Set environment for password
-        env = {"PGPASSWORD": password}
-
-        # Run the command and redirect output to file
-        result = _run_host_command(cmd, env=env)
+        compression = params.get("compression")
+        if dump_format != "directory" and (compression or is_s3_uri(path)):
+            # Compress or upload pg_dump's output while it is still being produced
+            result = _run_host_command_to_file(
+                cmd, path, env=env, compression=compression
+            )
+        else:
+            # Let pg_dump write the file or directory itself; nothing passes
+            # through Python. It writes a temporary sibling (pg_dump refuses
+            # to write into an existing directory anyway) so a failure keeps
+            # the last dump
+            partial = _partial_path(path)
+            try:
+                result = run_host_command(
+                    cmd + ["-f", partial],
+                    env=env,
+                    capture_stdout=False,
+                    timeout=COMMAND_TIMEOUT,
+                )
+            except Exception:
+                _remove_partial(partial)
+                raise
+            _finish_partial(partial, path, result.returncode == 0)
 
         if result.returncode == 0:
-            # Write output to file
-            with open(path, "w") as f:
-                f.write(result.stdout)
-
-            logger.info(f"PostgreSQL dump completed: {path}")
+            logger.info("PostgreSQL dump completed: %s", path)
             return format_success_response(
                 f"PostgreSQL dump completed successfully: {path}", path=path
             )
@@ -157,10 +502,40 @@ def _dump_postgres(params: Dict[str, Any], path: str) -> Dict[str, Any]:
             return format_error_response(error_msg)
 
     except Exception as e:
-        logger.error(f"PostgreSQL dump failed: {str(e)}")
+        logger.error("PostgreSQL dump failed: %s", e)
         return format_error_response(f"PostgreSQL dump failed: {str(e)}")
 
 
+def _postgres_table_count(
+    host: str, port: str, username: str, database: str, env: Dict[str, str]
+) -> Optional[int]:
+    """Count user tables in a PostgreSQL database, or None if it can't be read"""
+    if not shutil.which("psql"):
+        return None
+    result = run_host_command(
+        [
+            "psql",
+            "-h",
+            host,
+            "-p",
+            port,
+            "-U",
+            username,
+            "-d",
+            database,
+            "-At",
+            "-c",
+            "SELECT count(*) FROM pg_stat_user_tables",
+        ],
+        env=env,
+        timeout=COMMAND_TIMEOUT,
+    )
+    try:
+        return int(result.stdout) if result.returncode == 0 else None
+    except ValueError:
+        return None
+
+
 def _dump_mysql(params: Dict[str, Any], path: str) -> Dict[str, Any]:
     """Dump MySQL database using host mysqldump"""
     try:
@@ -180,27 +555,35 @@ def _dump_mysql(params: Dict[str, Any], path: str) -> Dict[str, Any]:
             return format_error_response(error_msg)
 
         logger.info(
-            f"MySQL dump: {host}:{port}, database: {database}, user: {username}"
+            "MySQL dump: %s:%s, database: %s, user: %s", host, port, database, username
         )
 
-        # Build mysqldump command
-        cmd = f"mysqldump -h {host} -P {port} -u {username} -p{password} {database}"
-
-        # Add options for better compatibility
-        cmd += " --single-transaction --routines --triggers"
-
-        # Set environment (password is passed via command line for MySQL)
-        env = {}
-
-        # Run the command and redirect output to file
-        result = _run_host_command(cmd, env=env)
+        # Credentials go through a private option file so the password never
+        # shows up in the process list; it must be mysqldump's first argument
+        option_file = write_mysql_option_file(username, password)
+        try:
+            cmd = [
+                "mysqldump",
+                f"--defaults-extra-file={option_file}",
+                "-h",
+                host,
+                "-P",
+                port,
+                database,
+            ]
+
+            # Add options for better compatibility
+            cmd += ["--single-transaction", "--quick", "--routines", "--triggers"]
+
+            compression = params.get("compression")
+            # Stream mysqldump's output straight into the dump file, compressing
+            # or uploading it on the way when requested
+            result = _run_host_command_to_file(cmd, path, compression=compression)
+        finally:
+            os.remove(option_file)
 
         if result.returncode == 0:
-            # Write output to file
-            with open(path, "w") as f:
-                f.write(result.stdout)
-
-            logger.info(f"MySQL dump completed: {path}")
+            logger.info("MySQL dump completed: %s", path)
             return format_success_response(
                 f"MySQL dump completed successfully: {path}", path=path
             )
@@ -210,7 +593,7 @@ def _dump_mysql(params: Dict[str, Any], path: str) -> Dict[str, Any]:
             return format_error_response(error_msg)
 
     except Exception as e:
-        logger.error(f"MySQL dump failed: {str(e)}")
+        logger.error("MySQL dump failed: %s", e)
         return format_error_response(f"MySQL dump failed: {str(e)}")
 
 
@@ -227,7 +610,7 @@ def _dump_mongodb(params: Dict[str, Any], path: str) -> Dict[str, Any]:
         if not database:
             return format_error_response("Database name is required for MongoDB dump.")
 
-        logger.info(f"MongoDB dump: database: {database}")
+        logger.info("MongoDB dump: database: %s", database)
 
         # For now, return an error since mongodump is not installed
         # TODO: Install MongoDB tools in the container or use a different approach
@@ -240,13 +623,13 @@ def _dump_mongodb(params: Dict[str, Any], path: str) -> Dict[str, Any]:
         os.makedirs(os.path.dirname(output_dir), exist_ok=True)
 
         # Build mongodump command
-        cmd = f'mongodump --uri "{uri}" --db {database} --out {output_dir}'
+        cmd = ["mongodump", "--uri", uri, "--db", database, "--out", output_dir]
 
         # Run the command
-        result = _run_host_command(cmd)
+        result = run_host_command(cmd, timeout=COMMAND_TIMEOUT)
 
         if result.returncode == 0:
-            logger.info(f"MongoDB dump completed: {output_dir}")
+            logger.info("MongoDB dump completed: %s", output_dir)
             return format_success_response(
                 f"MongoDB dump completed successfully: {output_dir}", path=output_dir
             )
@@ -256,7 +639,7 @@ def _dump_mongodb(params: Dict[str, Any], path: str) -> Dict[str, Any]:
             return format_error_response(error_msg)
 
     except Exception as e:
-        logger.error(f"MongoDB dump failed: {str(e)}")
+        logger.error("MongoDB dump failed: %s", e)
         return format_error_response(f"MongoDB dump failed: {str(e)}")
 
 
@@ -267,19 +650,22 @@ def _dump_redis(params: Dict[str, Any], path: str) -> Dict[str, Any]:
         port = str(params.get("port", 6379))
         password = params.get("password")
 
-        logger.info(f"Redis dump: {host}:{port}")
+        logger.info("Redis dump: %s:%s", host, port)
 
-        # Build redis-cli command
-        cmd = f"redis-cli -h {host} -p {port}"
-        if password:
-            cmd += f" -a {password}"
-        cmd += f" --rdb {path}"
+        # Build redis-cli command; --rdb streams a snapshot over a single
+        # replication connection without needing access to the server's disk
+        cmd = ["redis-cli", "-h", host, "-p", port, "--rdb", path]
 
-        # Run the command
-        result = _run_host_command(cmd)
+        # Pass the password through the environment so it never shows in ps
+        env = {"REDISCLI_AUTH": password} if password else None
+
+        # Run the command; redis-cli writes the snapshot file itself
+        result = run_host_command(
+            cmd, env=env, capture_stdout=False, timeout=COMMAND_TIMEOUT
+        )
 
         if result.returncode == 0:
-            logger.info(f"Redis dump completed: {path}")
+            logger.info("Redis dump completed: %s", path)
             return format_success_response(
                 f"Redis dump completed successfully: {path}", path=path
             )
@@ -289,25 +675,70 @@ def _dump_redis(params: Dict[str, Any], path: str) -> Dict[str, Any]:
             return format_error_response(error_msg)
 
     except Exception as e:
-        logger.error(f"Redis dump failed: {str(e)}")
+        logger.error("Redis dump failed: %s", e)
         return format_error_response(f"Redis dump failed: {str(e)}")
 
 
 def _dump_sqlite(params: Dict[str, Any], path: str) -> Dict[str, Any]:
-    """Dump SQLite database by copying the file"""
+    """Dump SQLite database using the online backup API"""
     try:
-        import shutil
-
         source_db = params["database"]
 
-        if os.path.exists(source_db):
-            shutil.copy2(source_db, path)
-            logger.info(f"SQLite dump completed: {path}")
-            return format_success_response(
-                f"SQLite dump completed successfully: {path}", path=path
-            )
-        else:
-            return format_error_response(f"SQLite database file not found: {source_db}")
+        # The backup goes to a temporary sibling that only replaces the last
+        # dump once it is complete
+        partial = _partial_path(path)
+        try:
+            try:
+                _backup_sqlite(source_db, partial)
+            except sqlite3.OperationalError:
+                if not os.path.exists(source_db):
+                    return format_error_response(
+                        f"SQLite database file not found: {source_db}"
+                    )
+                raise
+            except sqlite3.DatabaseError as e:
+                # Not something SQLite can read page by page; keep it byte
+                # for byte
+                logger.warning(
+                    "SQLite backup of %s failed (%s), copying the file instead",
+                    source_db,
+                    e,
+                )
+                copy_file(source_db, partial)
+            _finish_partial(partial, path, True)
+        finally:
+            # Nothing is left to remove once the dump has been moved into place
+            _remove_partial(partial)
+
+        logger.info("SQLite dump completed: %s", path)
+        return format_success_response(
+            f"SQLite dump completed successfully: {path}", path=path
+        )
     except Exception as e:
-        logger.error(f"SQLite dump failed: {str(e)}")
+        logger.error("SQLite dump failed: %s", e)
         return format_error_response(f"SQLite dump failed: {str(e)}")
+
+
+def _backup_sqlite(source_db: str, path: str) -> None:
+    """Copy a SQLite database with the backup API for a consistent snapshot"""
+    # Read-only so a missing source isn't silently created as an empty database
+    source_uri = Path(source_db).absolute().as_uri() + "?mode=ro"
+    src = sqlite3.connect(source_uri, uri=True)
+    try:
+        dst = sqlite3.connect(path)
+        try:
+            src.backup(dst, pages=1024)
+        finally:
+            dst.close()
+    finally:
+        src.close()
+
+
+# Dump handler per database type, built once at import
+_DUMP_FUNCTIONS: Dict[str, Callable[[Dict[str, Any], str], Dict[str, Any]]] = {
+    "postgres": _dump_postgres,
+    "mysql": _dump_mysql,
+    "mongodb": _dump_mongodb,
+    "redis": _dump_redis,
+    "sqlite": _dump_sqlite,
+}
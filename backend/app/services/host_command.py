@@ -0,0 +1,213 @@
+import os
+import logging
+import shlex
+import signal
+import subprocess
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional
+from app.core.utils import advise_dontneed, advise_sequential, decompress_stream
+
+logger = logging.getLogger(__name__)
+
+# Environment inherited by every database client, snapshotted once at import
+BASE_ENV = os.environ.copy()
+
+# Seconds a killed client gets to exit on SIGTERM before SIGKILL
+KILL_GRACE_SECONDS = 10
+
+# Only the tail of a command's stderr is kept for error reporting
+_STDERR_TAIL_BYTES = 8192
+
+
+def build_env(env: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """Get the environment for a host command with per-call overrides applied"""
+    return {**BASE_ENV, **env} if env else BASE_ENV
+
+
+def run_host_command(
+    args: List[str],
+    env: Optional[Dict[str, str]] = None,
+    cwd: Optional[str] = None,
+    capture_stdout: bool = True,
+    timeout: Optional[float] = None,
+) -> subprocess.CompletedProcess:
+    """Run a command (an argv list, never parsed by a shell) on the host system.
+
+    Pass capture_stdout=False for commands that write their own output file,
+    so no pipe is set up for a stdout that stays empty. After timeout seconds
+    the command's process group is killed (None means no limit).
+    """
+    try:
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Running host command: %s", shlex.join(args))
+        # stdout is captured as bytes and stderr goes to a temp file of which
+        # only the tail is kept, so a chatty command can't balloon memory;
+        # only a failing command's stderr is ever read. The command gets its
+        # own session so a timeout can take down anything it spawned too
+        with tempfile.TemporaryFile() as err:
+            proc = subprocess.Popen(
+                args,
+                env=build_env(env),
+                cwd=cwd,
+                stdout=subprocess.PIPE if capture_stdout else subprocess.DEVNULL,
+                stderr=err,
+                start_new_session=True,
+            )
+            timed_out = False
+            try:
+                stdout, _ = proc.communicate(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                kill_process_groups([proc], timeout=timeout)
+                stdout, _ = proc.communicate()
+                timed_out = True
+            stderr = _read_tail(err) if proc.returncode != 0 or timed_out else ""
+        if timed_out:
+            stderr += timeout_message(timeout)
+        result = subprocess.CompletedProcess(args, proc.returncode, stdout, stderr)
+
+        if result.returncode != 0:
+            logger.error("Command failed with return code %s", result.returncode)
+            # Decoding a large stdout is only worth it if it gets logged
+            if capture_stdout and logger.isEnabledFor(logging.ERROR):
+                logger.error(
+                    "stdout: %s", result.stdout.decode("utf-8", errors="replace")
+                )
+            logger.error("stderr: %s", result.stderr)
+
+        return result
+    except Exception as e:
+        logger.error("Failed to run command: %s", e)
+        raise
+
+
+def run_host_command_from_file(
+    args: List[str],
+    path: str,
+    env: Optional[Dict[str, str]] = None,
+    compression: Optional[str] = None,
+    timeout: Optional[float] = None,
+) -> subprocess.CompletedProcess:
+    """Run a command on the host system with a file streamed into its stdin.
+
+    A compressed file is decompressed in-process while the command is still
+    consuming it, so no plain copy is ever staged on disk. After timeout
+    seconds the command's process group is killed (None means no limit).
+    """
+    try:
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Running host command: %s < %s", shlex.join(args), path)
+        # stderr goes to a temp file so a chatty command can't fill the pipe
+        # while we're blocked writing its stdin
+        with open(path, "rb") as src, tempfile.TemporaryFile() as err:
+            # The read-ahead hint sticks to the open file, so it also covers
+            # a command reading src directly as its stdin
+            advise_sequential(src.fileno())
+            proc = subprocess.Popen(
+                args,
+                env=build_env(env),
+                stdin=subprocess.PIPE if compression else src,
+                stdout=subprocess.DEVNULL,
+                stderr=err,
+                start_new_session=True,
+            )
+
+            # Input may be relayed below, so the timeout is enforced by a
+            # watchdog rather than by wait()
+            timed_out = threading.Event()
+            watchdog = None
+            if timeout:
+                watchdog = threading.Timer(
+                    timeout, kill_process_groups, ([proc], timed_out, timeout)
+                )
+                watchdog.daemon = True
+                watchdog.start()
+
+            if compression:
+                try:
+                    decompress_stream(path, src, proc.stdin)
+                except BrokenPipeError:
+                    # The command exited early; its return code says why
+                    pass
+                except Exception:
+                    # Corrupt or truncated input: kill the client before its
+                    # stdin closes, so it can't commit a partial restore
+                    kill_process_groups([proc], timed_out)
+                    proc.wait()
+                    if watchdog is not None:
+                        watchdog.cancel()
+                    raise
+                finally:
+                    try:
+                        proc.stdin.close()
+                    except BrokenPipeError:
+                        pass
+
+            returncode = proc.wait()
+            if watchdog is not None:
+                watchdog.cancel()
+            # The dump has been read once and is done with; drop it from the
+            # page cache so it doesn't push out the database server's pages
+            advise_dontneed(src.fileno())
+
+            stderr = _read_tail(err)
+            if timed_out.is_set():
+                stderr += timeout_message(timeout)
+
+        if returncode != 0:
+            logger.error("Command failed with return code %s", returncode)
+            logger.error("stderr: %s", stderr)
+
+        return subprocess.CompletedProcess(args, returncode, stdout=None, stderr=stderr)
+    except Exception as e:
+        logger.error("Failed to run command: %s", e)
+        raise
+
+
+def _read_tail(err: Any) -> str:
+    """Decode the last _STDERR_TAIL_BYTES a command wrote to its stderr file"""
+    err.seek(max(0, err.seek(0, os.SEEK_END) - _STDERR_TAIL_BYTES))
+    return err.read().decode("utf-8", errors="replace")
+
+
+def write_mysql_option_file(username: str, password: str) -> str:
+    """Write MySQL client credentials to a private temporary option file"""
+
+    def quote(value: str) -> str:
+        return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+    # mkstemp creates the file readable by the owner only
+    fd, option_file = tempfile.mkstemp(prefix="mysql-", suffix=".cnf")
+    with os.fdopen(fd, "w") as f:
+        f.write(f"[client]\nuser={quote(username)}\npassword={quote(password)}\n")
+    return option_file
+
+
+def kill_process_groups(
+    procs: List[subprocess.Popen],
+    timed_out: Optional[threading.Event] = None,
+    timeout: Optional[float] = None,
+) -> None:
+    """Terminate commands along with every process they spawned"""
+    if timed_out is not None:
+        timed_out.set()
+    if timeout:
+        logger.error("Command timed out after %s seconds, terminating", timeout)
+    for proc in procs:
+        try:
+            os.killpg(proc.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    for proc in procs:
+        try:
+            proc.wait(timeout=KILL_GRACE_SECONDS)
+        except subprocess.TimeoutExpired:
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+
+def timeout_message(timeout: Optional[float]) -> str:
+    """Note appended to a timed-out command's stderr"""
+    return f"\nCommand timed out after {timeout} seconds"
@@ -0,0 +1,165 @@
+import os
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import boto3
+
+    AWS_AVAILABLE = True
+except ImportError:
+    AWS_AVAILABLE = False
+    logger.warning("boto3 not available. Streaming dumps to S3 disabled.")
+
+# S3 requires every part except the last to be at least 5 MiB, and allows
+# at most 10,000 parts per upload; the part size doubles every 1,000 parts
+# up to 512 MiB, so a dump of up to ~2.5 TiB fits
+S3_PART_SIZE = 8 * 1024 * 1024
+S3_MAX_PART_SIZE = 512 * 1024 * 1024
+S3_PARTS_PER_SIZE = 1000
+S3_MAX_PARTS = 10000
+S3_UPLOAD_WORKERS = 4
+
+# Bytes of finished parts held in memory waiting for upload; fewer parts are
+# queued as they grow, but always at least one
+S3_MAX_PENDING_BYTES = 256 * 1024 * 1024
+
+
+def is_s3_uri(path: str) -> bool:
+    """Check whether a dump destination points at S3"""
+    return path.startswith("s3://")
+
+
+def parse_s3_uri(uri: str) -> Tuple[str, str]:
+    """Split an s3://bucket/key URI into bucket and key"""
+    bucket, _, key = uri[len("s3://") :].partition("/")
+    return bucket, key
+
+
+class S3MultipartWriter:
+    """Write-only file object that streams its data into an S3 multipart upload.
+
+    Data is buffered into parts of at least S3_PART_SIZE which are uploaded by
+    a small thread pool while the producer keeps writing, so nothing touches
+    local disk.
+    """
+
+    def __init__(self, uri: str):
+        if not AWS_AVAILABLE:
+            raise RuntimeError("boto3 is required to stream dumps to S3")
+
+        self.bucket, self.key = parse_s3_uri(uri)
+        self._client = boto3.client(
+            "s3", region_name=os.getenv("AWS_REGION", "us-east-1")
+        )
+        self._upload_id = self._client.create_multipart_upload(
+            Bucket=self.bucket, Key=self.key
+        )["UploadId"]
+        self._executor = ThreadPoolExecutor(max_workers=S3_UPLOAD_WORKERS)
+        self._parts: List[Future] = []
+        # Parts before this index are known to have uploaded
+        self._uploaded = 0
+        self._buffer = bytearray()
+        self._closed = False
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:
+        self._buffer += data
+        part_size = self._part_size()
+        while len(self._buffer) >= part_size:
+            self._submit_part(bytes(self._buffer[:part_size]))
+            del self._buffer[:part_size]
+            part_size = self._part_size()
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def _part_size(self) -> int:
+        size = S3_PART_SIZE << (len(self._parts) // S3_PARTS_PER_SIZE)
+        return min(size, S3_MAX_PART_SIZE)
+
+    def _submit_part(self, body: bytes) -> None:
+        if len(self._parts) >= S3_MAX_PARTS:
+            raise RuntimeError(f"S3 upload to {self.key} exceeds {S3_MAX_PARTS} parts")
+
+        # Raise a failed part's error now, so the dump is aborted early rather
+        # than streamed in full before close() finds it
+        while self._uploaded < len(self._parts) and self._parts[self._uploaded].done():
+            self._parts[self._uploaded].result()
+            self._uploaded += 1
+
+        # Cap the parts held in memory by waiting on the oldest pending uploads
+        limit = min(S3_UPLOAD_WORKERS * 2, S3_MAX_PENDING_BYTES // self._part_size())
+        pending = [part for part in self._parts[self._uploaded :] if not part.done()]
+        while len(pending) >= max(1, limit):
+            pending.pop(0).result()
+
+        part_number = len(self._parts) + 1
+        self._parts.append(self._executor.submit(self._upload_part, part_number, body))
+
+    def _upload_part(self, part_number: int, body: bytes) -> Dict[str, Any]:
+        response = self._client.upload_part(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self._upload_id,
+            PartNumber=part_number,
+            Body=body,
+        )
+        return {"PartNumber": part_number, "ETag": response["ETag"]}
+
+    def close(self) -> None:
+        """Upload the remaining data and complete the multipart upload"""
+        if self._closed:
+            return
+        try:
+            if self._buffer or not self._parts:
+                self._submit_part(bytes(self._buffer))
+                self._buffer.clear()
+            parts = [part.result() for part in self._parts]
+            self._client.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=self.key,
+                UploadId=self._upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+            logger.info("Uploaded dump to s3://%s/%s", self.bucket, self.key)
+        except Exception:
+            self.abort()
+            raise
+        finally:
+            self._closed = True
+            self._executor.shutdown(wait=False)
+
+    def abort(self) -> None:
+        """Discard the multipart upload and every part sent so far"""
+        if self._closed:
+            return
+        self._closed = True
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        try:
+            self._client.abort_multipart_upload(
+                Bucket=self.bucket, Key=self.key, UploadId=self._upload_id
+            )
+        except Exception as e:
+            logger.error("Failed to abort S3 upload for %s: %s", self.key, e)
+
+    def __enter__(self) -> "S3MultipartWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def open_dump_output(path: str) -> Any:
+    """Open a local dump file or an S3 upload stream for writing"""
+    if is_s3_uri(path):
+        return S3MultipartWriter(path)
+    return open(path, "wb")
@@ -1,65 +1,211 @@
 import os
+import asyncio
+import atexit
+import functools
+import hashlib
+import inspect
+import ipaddress
+import json
 import logging
-import subprocess
 import shlex
-from typing import Dict, Any, Optional
+import shutil
+import socket
+import stat
+import subprocess
+import tarfile
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from app.core.utils import (
     get_consistent_path,
-    validate_db_type,
     get_db_default_port,
     format_error_response,
     format_success_response,
     get_restore_directory,
-    get_restore_path,
+    get_dump_compression,
+    get_dump_format,
+    get_parallel_jobs,
+    copy_file,
 )
+from app.core.config import settings
 from app.services.docker_compose_service import get_stack_database_info
+from app.services.docker_service import get_docker_client
+from app.services.host_command import (
+    run_host_command,
+    run_host_command_from_file,
+    write_mysql_option_file,
+)
 
 logger = logging.getLogger(__name__)
 
+try:
+    import psycopg2
+    import psycopg2.pool
+
+    PSYCOPG2_AVAILABLE = True
+except ImportError:
+    PSYCOPG2_AVAILABLE = False
+    logger.warning("psycopg2 not available. PostgreSQL resets will use psql.")
+
+# Database container ID per compose stack, with the time it expires, so a
+# batch of restores into the same stack skips the `docker ps` lookup while
+# a recreated stack is picked up again within the TTL
+_STACK_CONTAINER_TTL = 30
+_stack_containers: Dict[str, Tuple[str, float]] = {}
+_stack_containers_lock = threading.Lock()
+
+# Client binary each restore runs on the host, resolved once at import
+_RESTORE_BINARIES = {
+    "postgres": "psql",
+    "mysql": "mysql",
+    "redis": "redis-cli",
+}
+_HOST_BINARIES = {
+    db_type: shutil.which(binary) for db_type, binary in _RESTORE_BINARIES.items()
+}
+
+# Seconds a restore client may run before it is killed (None = no limit)
+COMMAND_TIMEOUT = settings.RESTORE_COMMAND_TIMEOUT or None
+
+# Database types the tool knows but can't restore yet, with the reason
+_UNSUPPORTED_RESTORES = {
+    "mongodb": (
+        "MongoDB restore is not currently supported. Please install mongorestore "
+        "tools in the container or use a different approach."
+    ),
+}
+
+# Half-second checks for a stack's Redis server to come back up on a restore
+_REDIS_RESTART_CHECKS = 60
+
+# Restores that can run inside a compose stack's database container
+_STACK_RESTORE_TYPES = {"postgres", "redis"}
+
+# Leading bytes of each dump file read ahead into the page cache
+_PREFETCH_BYTES = 1 << 30
+
+# pg_restore options for every archive restore: objects are owned by the
+# restoring user (the dump's roles may not exist on the target), and the
+# first error stops the restore instead of it grinding on to a failure
+_PG_RESTORE_OPTIONS = ["--no-owner", "--exit-on-error"]
+
+# Session settings for every restore connection: commits don't wait for the
+# WAL flush (a crashed restore is rerun anyway), and index builds get more
+# memory. Both are per-session and need no superuser
+_PG_RESTORE_SESSION_OPTIONS = "-c synchronous_commit=off -c maintenance_work_mem=256MB"
+
+# Custom-format archives smaller than this restore with a single worker by
+# default, since parallel workers only pay off on enough data to split
+_PG_PARALLEL_RESTORE_MIN_BYTES = 64 << 20
+
+# Empties every user table in one statement, for reset_mode="truncate"
+_TRUNCATE_ALL_TABLES = (
+    "DO $$ DECLARE tables text; BEGIN "
+    "SELECT string_agg(format('%I.%I', schemaname, tablename), ', ') INTO tables "
+    "FROM pg_tables WHERE schemaname NOT IN ('pg_catalog', 'information_schema'); "
+    "IF tables IS NOT NULL THEN "
+    "EXECUTE 'TRUNCATE TABLE ' || tables || ' CASCADE'; "
+    "END IF; END $$"
+)
+
+# Whether host.docker.internal has resolved, and until when a failed lookup
+# is trusted before it is tried again
+_HOST_LOOKUP_RETRY = 60
+_host_docker_internal_found = False
+_host_docker_internal_retry_at = 0.0
+
+# Background thread issuing the prefetch hints, which can block on the device
+_prefetch_executor = ThreadPoolExecutor(
+    max_workers=1, thread_name_prefix="restore-prefetch"
+)
+
+# Limit on restores running at once, with dedicated worker threads so a
+# long restore never occupies the event loop's default executor
+_restore_semaphore = asyncio.Semaphore(settings.RESTORE_CONCURRENCY)
+_restore_executor = ThreadPoolExecutor(
+    max_workers=settings.RESTORE_CONCURRENCY, thread_name_prefix="restore"
+)
+
+# Restores of a batch running at once unless the caller asks otherwise
+_RESTORE_BATCH_WORKERS = 4
+
+# Maintenance database connections per (host, port, user), with a digest of
+# the password they were opened with, reused across restores for the
+# drop/create reset; connecting gives up after _ADMIN_CONNECT_TIMEOUT seconds
+_ADMIN_POOL_SIZE = 4
+_ADMIN_CONNECT_TIMEOUT = 10
+_admin_pools: Dict[Tuple[str, str, str], Tuple[bytes, Any]] = {}
+_admin_pools_lock = threading.Lock()
+
+# Restores in progress, keyed on a digest of their arguments, so an identical
+# request arriving meanwhile (e.g. a double click) shares the running
+# restore's result instead of dropping the database under it
+_inflight_restores: Dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+# Restore directories already created by this process
+_ENSURED_DIRS: set = set()
+_ENSURED_LOCK = threading.Lock()
+
 
 def ensure_restore_directory_exists():
     """Ensure the restore directory exists and is accessible"""
     try:
         restore_dir = get_restore_directory()
+        if restore_dir in _ENSURED_DIRS:
+            return True
         os.makedirs(restore_dir, exist_ok=True)
-        logger.info(f"Restore directory is ready: {restore_dir}")
+        with _ENSURED_LOCK:
+            _ENSURED_DIRS.add(restore_dir)
+        logger.info("Restore directory is ready: %s", restore_dir)
         return True
     except Exception as e:
-        logger.error(f"Failed to ensure restore directory exists: {e}")
+        logger.error("Failed to ensure restore directory exists: %s", e)
         return False
 
 
-def _run_host_command(
-    cmd: str, env: Optional[Dict[str, str]] = None, cwd: Optional[str] = None
-) -> subprocess.CompletedProcess:
-    """Run a command on the host system"""
-    try:
-        # Parse command safely
-        args = shlex.split(cmd)
-
-        # Set up environment
-        process_env = os.environ.copy()
-        if env:
-            process_env.update(env)
-
-        logger.info(f"Running host command: {cmd}")
-        result = subprocess.run(
-            args,
-            env=process_env,
-            cwd=cwd,
-            capture_output=True,
-            text=True,
-        )
+def _prefetch_dump(path: str) -> None:
+    """Start reading a dump into the page cache before the client asks for it.
 
-        if result.returncode != 0:
-            logger.error(f"Command failed with return code {result.returncode}")
-            logger.error(f"stdout: {result.stdout}")
-            logger.error(f"stderr: {result.stderr}")
+    Only the first _PREFETCH_BYTES of each file are requested, so a huge dump
+    doesn't evict the whole page cache before the client even starts.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    if os.path.isdir(path):
+        files = [entry.path for entry in os.scandir(path) if entry.is_file()]
+    else:
+        files = [path]
+    for file_path in files:
+        try:
+            fd = os.open(file_path, os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, _PREFETCH_BYTES, os.POSIX_FADV_WILLNEED)
+            finally:
+                os.close(fd)
+        except OSError as e:
+            logger.debug("Could not prefetch %s: %s", file_path, e)
 
-        return result
-    except Exception as e:
-        logger.error(f"Failed to run command: {e}")
-        raise
+
+def _host_docker_internal_resolves() -> bool:
+    """Check whether host.docker.internal resolves in this environment"""
+    global _host_docker_internal_found, _host_docker_internal_retry_at
+    # A successful lookup holds for the life of the process; a failed one may
+    # have been a DNS hiccup, so it is tried again after a while
+    if _host_docker_internal_found:
+        return True
+    if time.monotonic() < _host_docker_internal_retry_at:
+        return False
+    try:
+        socket.gethostbyname("host.docker.internal")
+        _host_docker_internal_found = True
+        return True
+    except OSError:
+        logger.info("host.docker.internal does not resolve, keeping localhost")
+        _host_docker_internal_retry_at = time.monotonic() + _HOST_LOOKUP_RETRY
+        return False
 
 
 def _prepare_restore_params(
@@ -77,7 +223,7 @@ def _prepare_restore_params(
     # Use local database name if provided
     if local_database_name:
         params["database"] = local_database_name
-        logger.info(f"Using local database name for restore: {local_database_name}")
+        logger.info("Using local database name for restore: %s", local_database_name)
 
     # Use restore password if provided
     if restore_password:
@@ -91,48 +237,28 @@ def _prepare_restore_params(
     # Handle restore username with priority logic
     if restore_username:
         params["username"] = restore_username
-        logger.info(f"Using restore username: {restore_username}")
+        logger.info("Using restore username: %s", restore_username)
 
     # Handle restore host and port with priority logic
     if restore_host:
         params["host"] = restore_host
-        logger.info(f"Using restore host: {restore_host}")
+        logger.info("Using restore host: %s", restore_host)
     else:
         params["host"] = params.get("host", "localhost")
 
     if restore_port:
         params["port"] = restore_port
-        logger.info(f"Using restore port: {restore_port}")
+        logger.info("Using restore port: %s", restore_port)
     else:
         params["port"] = params.get("port", get_db_default_port(db_type) or 5432)
 
-    # For Docker-to-Docker communication, use host.docker.internal for localhost
-    if params["host"] == "localhost":
+    # For Docker-to-Docker communication, use host.docker.internal for
+    # localhost, but only where that name resolves; elsewhere every client
+    # connection would stall on the failed lookup
+    if params["host"] == "localhost" and _host_docker_internal_resolves():
         params["host"] = "host.docker.internal"
         logger.info("Using host.docker.internal for Docker-to-host communication")
 
-    # Handle MongoDB URI if present
-    if db_type == "mongodb" and "uri" in params:
-        try:
-            from urllib.parse import urlparse, urlunparse
-
-            uri = params["uri"]
-            parsed = urlparse(uri)
-            new_netloc = "localhost"
-            if parsed.port:
-                new_netloc += f":{parsed.port}"
-            if parsed.username:
-                if parsed.password:
-                    new_netloc = f"{parsed.username}:{parsed.password}@" + new_netloc
-                else:
-                    new_netloc = f"{parsed.username}@" + new_netloc
-            parsed = parsed._replace(netloc=new_netloc)
-            params["uri"] = urlunparse(parsed)
-        except Exception:
-            import re
-
-            params["uri"] = re.sub(r"//.*?:", "//localhost:", params["uri"])
-
     return params
 
 
@@ -147,11 +273,84 @@ def run_restore(
     restore_host: Optional[str] = None,
     restore_port: Optional[str] = None,
     stack_name: Optional[str] = None,
+    restore_jobs: Optional[int] = None,
+    reset_mode: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Run database restore operation, joining an identical one already running"""
+    arguments = [
+        db_type,
+        params,
+        config_name,
+        restore_password,
+        local_database_name,
+        dump_file_name,
+        restore_username,
+        restore_host,
+        restore_port,
+        stack_name,
+        restore_jobs,
+        reset_mode,
+    ]
+    key = _inflight_key(arguments)
+    with _inflight_lock:
+        future = _inflight_restores.get(key)
+        running = future is not None
+        if not running:
+            future = _inflight_restores[key] = Future()
+    if running:
+        logger.info(
+            "Identical %s restore for config '%s' is already running, "
+            "waiting for its result",
+            db_type,
+            config_name,
+        )
+        return future.result()
+
+    try:
+        result = _run_restore(*arguments)
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            del _inflight_restores[key]
+
+
+def _run_restore(
+    db_type: str,
+    params: Dict[str, Any],
+    config_name: str,
+    restore_password: Optional[str],
+    local_database_name: Optional[str],
+    dump_file_name: Optional[str],
+    restore_username: Optional[str],
+    restore_host: Optional[str],
+    restore_port: Optional[str],
+    stack_name: Optional[str],
+    restore_jobs: Optional[int],
+    reset_mode: Optional[str],
 ) -> Dict[str, Any]:
     """Run database restore operation with consistent file path"""
     try:
-        if not validate_db_type(db_type):
+        # Known but unsupported types fail before any preparation
+        if db_type in _UNSUPPORTED_RESTORES:
+            return format_error_response(_UNSUPPORTED_RESTORES[db_type])
+        # The handler lookup doubles as the supported-type check
+        restore = _RESTORE_FUNCTIONS.get(db_type)
+        if restore is None:
             return format_error_response(f"Unsupported database type: {db_type}")
+        # Stack restores run the client inside the stack's database container
+        if (
+            db_type in _RESTORE_BINARIES
+            and not _HOST_BINARIES[db_type]
+            and not (stack_name and db_type in _STACK_RESTORE_TYPES)
+        ):
+            return format_error_response(
+                f"{_RESTORE_BINARIES[db_type]} is not installed on the host. "
+                f"Please install it to run {db_type} restores."
+            )
         if not ensure_restore_directory_exists():
             return format_error_response("Failed to create or access restore directory")
         params = _prepare_restore_params(
@@ -163,36 +362,126 @@ def run_restore(
             restore_host,
             restore_port,
         )
-        path = get_consistent_path(config_name, db_type, dump_file_name)
-        logger.info(
-            f"Starting {db_type} restore operation for config '{config_name}' from path: {path}"
+        compression = get_dump_compression(db_type, params)
+        path = get_consistent_path(
+            config_name,
+            db_type,
+            dump_file_name,
+            compression,
+            dump_format=get_dump_format(db_type, params),
         )
-        if not os.path.exists(path):
+        try:
+            dump_stat = os.stat(path)
+        except FileNotFoundError:
             return format_error_response(
                 f"Restore file not found: {path}. Please ensure the dump file exists before attempting restore."
             )
+        # The size lets operators estimate how long the restore will take
         logger.info(
-            f"Restore connection - Host: {params.get('host')}, Port: {params.get('port')}, "
-            f"Database: {params.get('database')}, Username: {params.get('username')}"
+            "Starting %s restore operation for config '%s' from path: %s%s",
+            db_type,
+            config_name,
+            path,
+            "" if stat.S_ISDIR(dump_stat.st_mode) else f" ({dump_stat.st_size} bytes)",
         )
-        restore_functions = {
-            "postgres": lambda p, pa: _restore_postgres(p, pa, stack_name),
-            "mysql": _restore_mysql,
-            "mongodb": _restore_mongodb,
-            "redis": _restore_redis,
-            "sqlite": _restore_sqlite,
-        }
-        return restore_functions[db_type](params, path)
+        # Prefetching only hints the kernel, so nothing waits on it; the
+        # database is dropped and recreated while the dump is read ahead
+        _prefetch_executor.submit(_prefetch_dump, path)
+        logger.info(
+            "Restore connection - Host: %s, Port: %s, Database: %s, Username: %s",
+            params.get("host"),
+            params.get("port"),
+            params.get("database"),
+            params.get("username"),
+        )
+        if db_type == "redis":
+            restore = functools.partial(_restore_redis, stack_name=stack_name)
+        if db_type == "postgres":
+            restore = functools.partial(
+                _restore_postgres,
+                stack_name=stack_name,
+                restore_jobs=restore_jobs,
+                reset_mode=reset_mode,
+            )
+        if compression:
+            # Only PostgreSQL and MySQL dumps are compressed, and both clients
+            # read the dump from stdin: decompress straight into it so
+            # decompression overlaps the replay and no plain copy hits disk
+            return restore(params, path, compression=compression)
+        return restore(params, path)
     except Exception as e:
-        logger.error(f"Restore operation failed: {e}")
+        logger.error("Restore operation failed: %s", e)
         return format_error_response(f"Restore operation failed: {str(e)}")
 
 
-# Update _restore_postgres to accept stack_name and run inside container if provided
+def _inflight_key(arguments: List[Any]) -> str:
+    """Identify a restore by a digest of its arguments, which hold passwords"""
+    encoded = json.dumps(arguments, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+async def run_restore_async(**kwargs: Any) -> Dict[str, Any]:
+    """Run database restore operation without blocking the event loop"""
+    # Join an identical restore that is already running on the event loop,
+    # so waiting for its result doesn't hold a restore slot and thread
+    bound = inspect.signature(run_restore).bind(**kwargs)
+    bound.apply_defaults()
+    with _inflight_lock:
+        future = _inflight_restores.get(_inflight_key(list(bound.arguments.values())))
+    if future is not None:
+        logger.info(
+            "Identical %s restore for config '%s' is already running, "
+            "waiting for its result",
+            kwargs.get("db_type"),
+            kwargs.get("config_name"),
+        )
+        return await asyncio.wrap_future(future)
+
+    loop = asyncio.get_running_loop()
+    async with _restore_semaphore:
+        return await loop.run_in_executor(
+            _restore_executor, functools.partial(run_restore, **kwargs)
+        )
+
+
+async def run_restores_batch(
+    jobs: List[Dict[str, Any]], max_workers: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Run several restore operations in parallel, returning results in job order"""
+    batch_semaphore = asyncio.Semaphore(max_workers or _RESTORE_BATCH_WORKERS)
+    results: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+
+    # SQLite restores into the same directory run one after another so they
+    # never race on the target files; every other job runs on its own
+    groups: Dict[tuple, List[int]] = {}
+    for index, job in enumerate(jobs):
+        groups.setdefault(_restore_group_key(job, index), []).append(index)
+
+    async def run_group(indexes: List[int]) -> None:
+        async with batch_semaphore:
+            for index in indexes:
+                results[index] = await run_restore_async(**jobs[index])
+
+    await asyncio.gather(*(run_group(group) for group in groups.values()))
+
+    return results
+
+
+def _restore_group_key(job: Dict[str, Any], index: int) -> tuple:
+    """Group SQLite restores by target directory; other jobs get a group each"""
+    if job["db_type"] == "sqlite":
+        target_db = job.get("local_database_name") or job["params"].get("database")
+        return ("sqlite", os.path.dirname(str(target_db)))
+    return ("job", index)
 
 
 def _restore_postgres(
-    params: Dict[str, Any], path: str, stack_name: Optional[str] = None
+    params: Dict[str, Any],
+    path: str,
+    stack_name: Optional[str] = None,
+    restore_jobs: Optional[int] = None,
+    compression: Optional[str] = None,
+    reset_mode: Optional[str] = None,
 ) -> Dict[str, Any]:
     """Restore PostgreSQL database using host psql or inside container if stack_name is provided"""
     try:
@@ -209,76 +498,199 @@ def _restore_postgres(
             error_msg = "Username and password are required for PostgreSQL restore."
             logger.error(error_msg)
             return format_error_response(error_msg)
-        if ":" in host:
-            host_parts = host.split(":")
-            if len(host_parts) == 2 and host_parts[1].isdigit():
-                host = host_parts[0]
-                port = host_parts[1]
-                logger.info(
-                    f"Extracted host '{host}' and port '{port}' from combined host parameter"
-                )
+        host, port = _split_host_port(host, port)
         logger.info(
-            f"PostgreSQL restore: {host}:{port}, database: {database}, user: {username}"
+            "PostgreSQL restore: %s:%s, database: %s, user: %s",
+            host,
+            port,
+            database,
+            username,
         )
-        env = {"PGPASSWORD": password}
+        env = {"PGPASSWORD": password, "PGOPTIONS": _PG_RESTORE_SESSION_OPTIONS}
 
-        def docker_exec(cmd):
-            info = get_stack_database_info(stack_name)
-            if not info.get("success"):
-                return format_error_response(
-                    f"Could not find database container for stack '{stack_name}': {info.get('message')}"
+        def docker_exec(args, stdin_path=None):
+            container_id = _get_stack_container(stack_name)
+            if not isinstance(container_id, str):
+                return container_id
+            # The password and session settings are handed over through the
+            # environment, not argv; with stdin_path the dump is streamed
+            # into the exec's stdin
+            docker_cmd = ["docker", "exec", "-e", "PGPASSWORD", "-e", "PGOPTIONS"]
+            if stdin_path:
+                docker_cmd.append("-i")
+            docker_cmd += [container_id, *args]
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Running in container %s: %s", container_id, shlex.join(args))
+            if stdin_path:
+                result = run_host_command_from_file(
+                    docker_cmd,
+                    stdin_path,
+                    env=env,
+                    compression=compression,
+                    timeout=COMMAND_TIMEOUT,
                 )
-            container_id = info["container"]["id"]
-            docker_cmd = (
-                f'docker exec -e PGPASSWORD={password} {container_id} bash -c "{cmd}"'
-            )
-            logger.info(f"Running in container: {docker_cmd}")
-            result = subprocess.run(
-                docker_cmd, shell=True, capture_output=True, text=True
-            )
-            if result.returncode != 0:
-                logger.error(f"Command failed: {result.stderr}")
+            else:
+                result = run_host_command(
+                    docker_cmd, env=env, capture_stdout=False, timeout=COMMAND_TIMEOUT
+                )
+            if result.returncode != 0 and "No such container" in result.stderr:
+                _forget_stack_container(stack_name)
             return result
 
-        # Step 1: Drop database if it exists
-        try:
-            drop_cmd = f"dropdb -h {host} -p {port} -U {username} {database} --force"
-            result = (
-                docker_exec(drop_cmd)
-                if stack_name
-                else _run_host_command(drop_cmd, env=env)
-            )
-            if hasattr(result, "returncode") and result.returncode == 0:
-                logger.info(f"Database '{database}' dropped successfully")
+        connection = ["-h", host, "-p", port, "-U", username]
+        reset_mode = reset_mode or "drop"
+        archive = not compression and _is_pg_archive(path)
+        # A truncate reset keeps the schema, so an archive only loads its data
+        # instead of failing on the first CREATE of an existing object
+        archive_options = list(_PG_RESTORE_OPTIONS)
+        if reset_mode == "truncate":
+            archive_options.append("--data-only")
+        if archive:
+            # Custom and directory-format dumps restore with parallel workers;
+            # a single worker loads everything in one transaction instead,
+            # committing once rather than per object (the two can't combine)
+            jobs = restore_jobs or get_parallel_jobs(params)
+            if (
+                not restore_jobs
+                and not params.get("parallel_jobs")
+                and os.path.isfile(path)
+                and os.path.getsize(path) < _PG_PARALLEL_RESTORE_MIN_BYTES
+            ):
+                # Unless asked for, skip workers on a small archive: it loads
+                # faster in one transaction than they take to start
+                jobs = 1
+            load = ["-j", str(jobs)] if jobs > 1 else ["--single-transaction"]
+            restore_cmd = ["pg_restore", *connection, "-d", database, *load]
+            restore_cmd += [*archive_options, path]
+        else:
+            restore_cmd = ["psql", *connection, "-d", database, "-f", path]
+
+        # Reset the database by dropping and recreating it from the
+        # maintenance database, or by emptying every table in place, which
+        # keeps roles, extensions and the schema
+        quoted_database = '"' + database.replace('"', '""') + '"'
+        if reset_mode == "drop":
+            session_database = "postgres"
+            statements = [
+                f"DROP DATABASE IF EXISTS {quoted_database} WITH (FORCE)",
+                f"CREATE DATABASE {quoted_database}",
+            ]
+        elif reset_mode == "truncate":
+            session_database = database
+            statements = [_TRUNCATE_ALL_TABLES]
+        else:
+            session_database = database
+            statements = []
+        reset_cmd = ["psql", *connection, "-d", session_database]
+        reset_cmd += ["-v", "ON_ERROR_STOP=1"]
+        for statement in statements:
+            reset_cmd += ["-c", statement]
+
+        if stack_name:
+            # Reset and restore in a single docker exec instead of paying for
+            # a container lookup and exec round trip per step; the shell
+            # inside the container is only there to chain the steps. The
+            # reset statements share one psql client
+            reset = f"{shlex.join(reset_cmd)} && " if statements else ""
+            if os.path.isdir(path):
+                # Directory archives can't be streamed, so the container has
+                # to see the dump at the same path
+                stdin_path = None
+            else:
+                # The container can't see host paths, so the dump is streamed
+                # in from the host; pg_restore can't run parallel workers on
+                # a stream
+                stdin_path = path
+                if archive:
+                    restore_cmd = ["pg_restore", *connection, "-d", database]
+                    restore_cmd += archive_options
+                    if jobs == 1:
+                        restore_cmd.append("--single-transaction")
+                else:
+                    restore_cmd = ["psql", *connection, "-d", database, "-f", "-"]
+            if reset:
+                # The restore client replaces the shell rather than running
+                # under it
+                script = f"{reset}exec {shlex.join(restore_cmd)}"
+                result = docker_exec(["bash", "-c", script], stdin_path=stdin_path)
+            else:
+                # Nothing to chain, so the client is exec'd without a shell
+                result = docker_exec(restore_cmd, stdin_path=stdin_path)
+            if not hasattr(result, "returncode"):
+                return result
+        else:
+            if statements and (archive or PSYCOPG2_AVAILABLE):
+                # A reset of its own runs over psycopg2 when available, on a
+                # pooled maintenance connection for drop/create, instead of
+                # starting a psql client just for a couple of statements
+                if PSYCOPG2_AVAILABLE:
+                    result = _run_postgres_statements(
+                        host, port, username, password, session_database, statements
+                    )
+                else:
+                    result = run_host_command(
+                        reset_cmd,
+                        env=env,
+                        capture_stdout=False,
+                        timeout=COMMAND_TIMEOUT,
+                    )
+                if result.returncode != 0:
+                    error_msg = f"Failed to reset database '{database}': {result.stderr}"
+                    logger.error(error_msg)
+                    return format_error_response(error_msg)
+                logger.info("Database '%s' reset (%s)", database, reset_mode)
+                session_database, statements = database, []
+
+            if archive:
+                result = run_host_command(
+                    restore_cmd, env=env, capture_stdout=False, timeout=COMMAND_TIMEOUT
+                )
             else:
-                logger.info(
-                    f"Database '{database}' did not exist or drop failed (continuing)"
+                # Plain SQL is replayed by one psql session, which also runs
+                # a reset not done above; like psql -f, a failing statement in
+                # the dump doesn't abort the restore
+                session = ["psql", *connection, "-d", session_database]
+                session += ["-v", "ON_ERROR_STOP=1"]
+                for statement in statements:
+                    session += ["-c", statement]
+                if session_database != database:
+                    session += ["-c", f"\\connect {quoted_database}"]
+                session += ["-c", "\\unset ON_ERROR_STOP", "-f", "-"]
+                # The dump is always fed through stdin: an uncompressed file
+                # becomes psql's stdin directly, opened with a sequential
+                # read-ahead hint so the kernel reads ahead while statements
+                # are applied. psql's per-statement output is discarded
+                result = run_host_command_from_file(
+                    session,
+                    path,
+                    env=env,
+                    compression=compression,
+                    timeout=COMMAND_TIMEOUT,
                 )
-        except Exception as e:
-            logger.info(
-                f"Database '{database}' did not exist or drop failed (continuing): {str(e)}"
-            )
-        # Step 2: Create fresh database
-        create_cmd = f"createdb -h {host} -p {port} -U {username} {database}"
-        result = (
-            docker_exec(create_cmd)
-            if stack_name
-            else _run_host_command(create_cmd, env=env)
-        )
-        if hasattr(result, "returncode") and result.returncode != 0:
-            error_msg = f"Failed to create database '{database}': {getattr(result, 'stderr', '')}"
-            logger.error(error_msg)
-            return format_error_response(error_msg)
-        logger.info(f"Database '{database}' created successfully")
-        # Step 3: Perform the actual restore
-        restore_cmd = f"psql -h {host} -p {port} -U {username} -d {database} -f {path}"
-        result = (
-            docker_exec(restore_cmd)
-            if stack_name
-            else _run_host_command(restore_cmd, env=env)
-        )
+
         if hasattr(result, "returncode") and result.returncode == 0:
-            logger.info(f"PostgreSQL restore completed: {path}")
+            logger.info("PostgreSQL restore completed: %s", path)
+            # Refresh planner statistics, which a restore doesn't carry over,
+            # so the first queries aren't planned blind; opt-in, also pull
+            # the hottest tables into shared buffers so they don't start cold
+            post_restore_cmd = ["psql", *connection, "-d", database, "-c", "ANALYZE"]
+            if params.get("prewarm_tables"):
+                post_restore_cmd += ["-c", "CREATE EXTENSION IF NOT EXISTS pg_prewarm"]
+                for table in params["prewarm_tables"]:
+                    post_restore_cmd += ["-c", f"SELECT pg_prewarm('{table}')"]
+            if stack_name:
+                # ANALYZE can outlast the Docker API's read timeout, so this
+                # goes through docker exec like the restore itself
+                post_restore = docker_exec(post_restore_cmd)
+            else:
+                post_restore = run_host_command(
+                    post_restore_cmd,
+                    env=env,
+                    capture_stdout=False,
+                    timeout=COMMAND_TIMEOUT,
+                )
+            if getattr(post_restore, "returncode", 1) != 0:
+                logger.warning("Could not analyze or prewarm tables of '%s'", database)
             return format_success_response(
                 f"PostgreSQL restore completed successfully from: {path}", path=path
             )
@@ -287,11 +699,163 @@ def _restore_postgres(
             logger.error(error_msg)
             return format_error_response(error_msg)
     except Exception as e:
-        logger.error(f"PostgreSQL restore failed: {str(e)}")
+        logger.error("PostgreSQL restore failed: %s", e)
         return format_error_response(f"PostgreSQL restore failed: {str(e)}")
 
 
-def _restore_mysql(params: Dict[str, Any], path: str) -> Dict[str, Any]:
+def _get_stack_container(stack_name: str):
+    """Get the database container ID for a stack, looking it up once per TTL"""
+    with _stack_containers_lock:
+        cached = _stack_containers.get(stack_name)
+    if cached and cached[1] > time.monotonic():
+        return cached[0]
+    info = get_stack_database_info(stack_name)
+    if not info.get("success"):
+        return format_error_response(
+            f"Could not find database container for stack '{stack_name}': {info.get('message')}"
+        )
+    container_id = info["container"]["id"]
+    with _stack_containers_lock:
+        _stack_containers[stack_name] = (
+            container_id,
+            time.monotonic() + _STACK_CONTAINER_TTL,
+        )
+    return container_id
+
+
+def _forget_stack_container(stack_name: str) -> None:
+    """Drop a cached stack container, e.g. after the stack was recreated"""
+    with _stack_containers_lock:
+        _stack_containers.pop(stack_name, None)
+
+
+def _split_host_port(host: str, port: str) -> Tuple[str, str]:
+    """Take the port out of a combined host:port parameter, if there is one"""
+    name, colon, host_port = host.partition(":")
+    if colon and host_port.isdigit():
+        logger.info(
+            "Extracted host '%s' and port '%s' from combined host parameter",
+            name,
+            host_port,
+        )
+        return name, host_port
+    return host, port
+
+
+def _is_pg_archive(path: str) -> bool:
+    """Check whether a dump is a pg_dump custom/directory archive, not plain SQL"""
+    if os.path.isdir(path):
+        return os.path.exists(os.path.join(path, "toc.dat"))
+    # Custom-format archives start with pg_dump's magic bytes
+    with open(path, "rb") as f:
+        return f.read(5) == b"PGDMP"
+
+
+def _get_admin_pool(
+    host: str, port: str, username: str, password: str
+) -> "psycopg2.pool.ThreadedConnectionPool":
+    """Get the pool of maintenance database connections for a server and login"""
+    key = (host, port, username)
+    digest = hashlib.sha256(password.encode()).digest()
+    with _admin_pools_lock:
+        entry = _admin_pools.get(key)
+    if entry is not None and entry[0] == digest:
+        return entry[1]
+
+    # A new pool is only kept once its first connection has authenticated,
+    # so a changed password replaces the pool while a wrong one never gets
+    # a connection opened with another password. One connection is kept open
+    # between restores. It's opened outside the lock, with a timeout, so an
+    # unreachable server can't hold up resets against every other server
+    pool = psycopg2.pool.ThreadedConnectionPool(
+        1,
+        _ADMIN_POOL_SIZE,
+        host=host,
+        port=port,
+        user=username,
+        password=password,
+        dbname="postgres",
+        connect_timeout=_ADMIN_CONNECT_TIMEOUT,
+    )
+    with _admin_pools_lock:
+        entry = _admin_pools.get(key)
+        if entry is not None and entry[0] == digest:
+            # Another restore opened the same pool meanwhile
+            pool.closeall()
+            return entry[1]
+        if entry is not None:
+            # Connections still checked out go back to the old pool as usual;
+            # they are closed once it is garbage collected
+            atexit.unregister(entry[1].closeall)
+        atexit.register(pool.closeall)
+        _admin_pools[key] = (digest, pool)
+        return pool
+
+
+def _run_postgres_statements(
+    host: str,
+    port: str,
+    username: str,
+    password: str,
+    database: str,
+    statements: List[str],
+) -> subprocess.CompletedProcess:
+    """Run statements over an autocommit connection, reported like psql.
+
+    Statements against the maintenance database reuse a pooled connection;
+    any other database gets a one-off connection, since a pooled one would
+    hold it open and be cut off the next time it's dropped.
+    """
+
+    def execute(conn):
+        # DROP/CREATE DATABASE can't run inside a transaction block
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            for statement in statements:
+                cur.execute(statement)
+
+    success = subprocess.CompletedProcess(statements, 0, stdout=None, stderr="")
+    try:
+        pool = None
+        if database == "postgres":
+            pool = _get_admin_pool(host, port, username, password)
+        for attempt in range(2 if pool else 0):
+            try:
+                conn = pool.getconn()
+            except psycopg2.pool.PoolError:
+                # Every pooled connection is busy; don't wait for one
+                break
+            try:
+                execute(conn)
+                return success
+            except psycopg2.OperationalError:
+                # An idle pooled connection may have been cut off, e.g. by a
+                # server restart; retry once on a fresh one
+                if not conn.closed or attempt:
+                    raise
+            finally:
+                pool.putconn(conn, close=bool(conn.closed))
+
+        conn = psycopg2.connect(
+            host=host,
+            port=port,
+            user=username,
+            password=password,
+            dbname=database,
+            connect_timeout=_ADMIN_CONNECT_TIMEOUT,
+        )
+        try:
+            execute(conn)
+        finally:
+            conn.close()
+        return success
+    except psycopg2.Error as e:
+        return subprocess.CompletedProcess(statements, 1, stdout=None, stderr=str(e))
+
+
+def _restore_mysql(
+    params: Dict[str, Any], path: str, compression: Optional[str] = None
+) -> Dict[str, Any]:
     """Restore MySQL database using host mysql"""
     try:
         host = params.get("host", "localhost")
@@ -310,29 +874,39 @@ def _restore_mysql(params: Dict[str, Any], path: str) -> Dict[str, Any]:
             return format_error_response(error_msg)
 
         # Clean up host parameter - remove port if it's included in the host
-        if ":" in host:
-            host_parts = host.split(":")
-            if len(host_parts) == 2 and host_parts[1].isdigit():
-                host = host_parts[0]
-                port = host_parts[1]
-                logger.info(
-                    f"Extracted host '{host}' and port '{port}' from combined host parameter"
-                )
+        host, port = _split_host_port(host, port)
 
         logger.info(
-            f"MySQL restore: {host}:{port}, database: {database}, user: {username}"
+            "MySQL restore: %s:%s, database: %s, user: %s",
+            host,
+            port,
+            database,
+            username,
         )
 
-        # Build mysql command to restore from file
-        restore_cmd = (
-            f"mysql -h {host} -P {port} -u {username} -p{password} {database} < {path}"
-        )
+        # Credentials go through a private option file, never argv (must be
+        # mysql's first option); the dump is streamed into its stdin
+        option_file = write_mysql_option_file(username, password)
+        try:
+            restore_cmd = [
+                "mysql",
+                f"--defaults-extra-file={option_file}",
+                "-h",
+                host,
+                "-P",
+                port,
+                database,
+            ]
 
-        # Run the command
-        result = _run_host_command(restore_cmd)
+            # Run the command
+            result = run_host_command_from_file(
+                restore_cmd, path, compression=compression, timeout=COMMAND_TIMEOUT
+            )
+        finally:
+            os.remove(option_file)
 
         if result.returncode == 0:
-            logger.info(f"MySQL restore completed: {path}")
+            logger.info("MySQL restore completed: %s", path)
             return format_success_response(
                 f"MySQL restore completed successfully from: {path}", path=path
             )
@@ -342,105 +916,237 @@ def _restore_mysql(params: Dict[str, Any], path: str) -> Dict[str, Any]:
             return format_error_response(error_msg)
 
     except Exception as e:
-        logger.error(f"MySQL restore failed: {str(e)}")
+        logger.error("MySQL restore failed: %s", e)
         return format_error_response(f"MySQL restore failed: {str(e)}")
 
 
-def _restore_mongodb(params: Dict[str, Any], path: str) -> Dict[str, Any]:
-    """Restore MongoDB database using host mongorestore"""
+def _restore_redis(
+    params: Dict[str, Any], path: str, stack_name: Optional[str] = None
+) -> Dict[str, Any]:
+    """Restore Redis by loading the RDB dump in place of the server's data file"""
     try:
-        uri = params.get("uri")
-        database = params.get("database")
+        host = params.get("host", "localhost")
+        port = str(params.get("port", 6379))
+        password = params.get("password")
 
-        if not uri:
-            return format_error_response("MongoDB URI is required")
-        # database is optional for MongoDB
+        # Clean up host parameter - remove port if it's included in the host
+        host, port = _split_host_port(host, port)
 
-        logger.info(f"MongoDB restore: database: {database}")
+        # The password is passed through the environment, not argv
+        env = {"REDISCLI_AUTH": password} if password else None
+        if stack_name:
+            return _restore_redis_container(stack_name, path, env)
 
-        # For now, return an error since mongorestore is not installed
-        # TODO: Install MongoDB tools in the container or use a different approach
-        return format_error_response(
-            "MongoDB restore is not currently supported. Please install mongorestore tools in the container or use a different approach."
-        )
+        # The dump is copied over the server's data file on this host, so the
+        # server must provably be running here: a remote server with a data
+        # directory of the same name would reload its own old file instead
+        if not _is_loopback_host(host):
+            return format_error_response(
+                f"Redis restore failed: {host} is not a loopback address, so its "
+                "data file can't be replaced from this host; set stack_name to "
+                "restore into a stack's container"
+            )
 
-        # Build mongorestore command
-        restore_cmd = f"mongorestore --uri '{uri}' --db {database} {path}"
+        logger.info("Redis restore: %s:%s", host, port)
+        redis_cli = ["redis-cli", "-h", host, "-p", port]
 
-        # Run the command
-        result = _run_host_command(restore_cmd)
+        # Ask the server where it loads its RDB file from
+        config = {}
+        for name in ("dir", "dbfilename"):
+            result = run_host_command(
+                [*redis_cli, "CONFIG", "GET", name], env=env, timeout=COMMAND_TIMEOUT
+            )
+            config[name] = _parse_redis_config(result.stdout, name)
+            if result.returncode != 0 or not config[name]:
+                return format_error_response(
+                    f"Redis restore failed: could not read the server's {name}"
+                )
+        if not os.path.isdir(config["dir"]):
+            return format_error_response(
+                f"Redis restore failed: data directory {config['dir']} is not on "
+                "this host; set stack_name to restore into a stack's container"
+            )
 
-        if result.returncode == 0:
-            logger.info(f"MongoDB restore completed: {path}")
+        # The reload below needs DEBUG, which Redis 7 rejects by default
+        # (enable-debug-command) and ACLs may deny; find out before the data
+        # file is overwritten, as the server would then save over the dump
+        if not _redis_debug_allowed(redis_cli, env):
+            return format_error_response(
+                "Redis restore failed: the server does not allow the DEBUG "
+                "command needed to reload its data; set enable-debug-command, "
+                "or set stack_name to restore into a stack's container"
+            )
+
+        # Copy the dump over the data file and have the server load it
+        # without saving (and so overwriting) its current dataset first
+        data_file = os.path.join(config["dir"], config["dbfilename"])
+        if not (os.path.exists(data_file) and os.path.samefile(path, data_file)):
+            copy_file(path, data_file, copy_metadata=False)
+        result = run_host_command(
+            [*redis_cli, "DEBUG", "RELOAD", "NOSAVE"], env=env, timeout=COMMAND_TIMEOUT
+        )
+
+        if result.returncode == 0 and result.stdout.startswith(b"OK"):
+            logger.info("Redis restore completed: %s", path)
             return format_success_response(
-                f"MongoDB restore completed successfully from: {path}", path=path
+                f"Redis restore completed successfully from: {path}", path=path
             )
         else:
-            error_msg = f"MongoDB restore failed: {result.stderr}"
+            reply = result.stdout.decode("utf-8", errors="replace").strip()
+            error_msg = f"Redis restore failed: {result.stderr or reply}"
             logger.error(error_msg)
             return format_error_response(error_msg)
 
     except Exception as e:
-        logger.error(f"MongoDB restore failed: {str(e)}")
-        return format_error_response(f"MongoDB restore failed: {str(e)}")
+        logger.error("Redis restore failed: %s", e)
+        return format_error_response(f"Redis restore failed: {str(e)}")
 
 
-def _restore_redis(params: Dict[str, Any], path: str) -> Dict[str, Any]:
-    """Restore Redis database using host redis-cli"""
+def _is_loopback_host(host: str) -> bool:
+    """Check whether a host name or address refers to this machine's loopback"""
+    if host == "localhost":
+        return True
     try:
-        host = params.get("host", "localhost")
-        port = str(params.get("port", 6379))
-        password = params.get("password")
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
 
-        # Clean up host parameter - remove port if it's included in the host
-        if ":" in host:
-            host_parts = host.split(":")
-            if len(host_parts) == 2 and host_parts[1].isdigit():
-                host = host_parts[0]
-                port = host_parts[1]
-                logger.info(
-                    f"Extracted host '{host}' and port '{port}' from combined host parameter"
-                )
 
-        logger.info(f"Redis restore: {host}:{port}")
+def _redis_debug_allowed(redis_cli: List[str], env: Optional[Dict[str, str]]) -> bool:
+    """Check whether a Redis server accepts DEBUG from this client"""
+    # DEBUG HELP goes through the same protected-command and ACL checks as
+    # DEBUG RELOAD without touching the dataset
+    result = run_host_command(
+        [*redis_cli, "DEBUG", "HELP"], env=env, timeout=COMMAND_TIMEOUT
+    )
+    return result.returncode == 0 and not _is_redis_error(result.stdout)
 
-        # Build redis-cli command to restore from file
-        restore_cmd = f"redis-cli -h {host} -p {port}"
-        if password:
-            restore_cmd += f" -a {password}"
-        restore_cmd += f" --pipe < {path}"
 
-        # Run the command
-        result = _run_host_command(restore_cmd)
+def _restore_redis_container(
+    stack_name: str, path: str, env: Optional[Dict[str, str]]
+) -> Dict[str, Any]:
+    """Load an RDB dump into a stack's Redis container and restart it on it"""
+    container_id = _get_stack_container(stack_name)
+    if not isinstance(container_id, str):
+        return container_id
+    container = get_docker_client().containers.get(container_id)
+    logger.info("Redis restore into container %s", container_id)
 
-        if result.returncode == 0:
-            logger.info(f"Redis restore completed: {path}")
-            return format_success_response(
-                f"Redis restore completed successfully from: {path}", path=path
+    config = {}
+    for name in ("dir", "dbfilename", "appendonly"):
+        exit_code, output = container.exec_run(
+            ["redis-cli", "CONFIG", "GET", name], environment=env
+        )
+        config[name] = _parse_redis_config(output, name)
+        if exit_code != 0 or not config[name]:
+            return format_error_response(
+                f"Redis restore failed: could not read the container's {name}"
             )
-        else:
-            error_msg = f"Redis restore failed: {result.stderr}"
-            logger.error(error_msg)
-            return format_error_response(error_msg)
+    if config["appendonly"] == "yes":
+        # With AOF enabled Redis starts from the AOF and ignores the RDB file
+        return format_error_response(
+            "Redis restore failed: the container's server has appendonly "
+            "enabled, so it would ignore the restored RDB file"
+        )
+    run_id = _redis_container_run_id(container, env)
 
+    # Stream the dump into the container's data directory as a tar archive,
+    # straight through the Docker API without starting another container
+    with tempfile.TemporaryFile() as archive:
+        with tarfile.open(fileobj=archive, mode="w") as tar:
+            tar.add(path, arcname=config["dbfilename"])
+        archive.seek(0)
+        if not container.put_archive(config["dir"], archive):
+            return format_error_response(
+                f"Redis restore failed: could not copy the dump into {container_id}"
+            )
+
+    # Redis only reads its RDB file at startup, so stop it without saving
+    # over the new file, then bring the container back up. A refused
+    # SHUTDOWN would leave it running to save its old dataset over the dump.
+    # When Redis is the container's main process the exec dies with it, so
+    # a failed exit code only means refusal if the same server still answers
+    exit_code, output = container.exec_run(
+        ["redis-cli", "SHUTDOWN", "NOSAVE"], environment=env
+    )
+    if _is_redis_error(output) or (
+        exit_code != 0 and _redis_container_run_id(container, env) == run_id
+    ):
+        reply = output.decode("utf-8", errors="replace").strip()
+        error_msg = f"Redis restore failed: SHUTDOWN was refused: {reply}"
+        logger.error(error_msg)
+        return format_error_response(error_msg)
+    try:
+        container.wait(condition="not-running", timeout=60)
     except Exception as e:
-        logger.error(f"Redis restore failed: {str(e)}")
-        return format_error_response(f"Redis restore failed: {str(e)}")
+        # A restart policy may already have brought it back up; the run_id
+        # check below tells whether the server really restarted
+        logger.info("Redis container %s did not report stopping: %s", container_id, e)
+    container.reload()
+    if container.status != "running":
+        container.start()
+
+    # Only a new server process has loaded the restored file
+    for _ in range(_REDIS_RESTART_CHECKS):
+        new_run_id = _redis_container_run_id(container, env)
+        if new_run_id and new_run_id != run_id:
+            break
+        time.sleep(0.5)
+    else:
+        error_msg = (
+            f"Redis restore failed: the server in {container_id} did not restart"
+        )
+        logger.error(error_msg)
+        return format_error_response(error_msg)
+
+    logger.info("Redis restore completed: %s", path)
+    return format_success_response(
+        f"Redis restore completed successfully from: {path}", path=path
+    )
+
+
+def _redis_container_run_id(
+    container: Any, env: Optional[Dict[str, str]]
+) -> Optional[str]:
+    """Get the run_id identifying the Redis server process in a container"""
+    exit_code, output = container.exec_run(
+        ["redis-cli", "INFO", "server"], environment=env
+    )
+    if exit_code != 0:
+        return None
+    for line in output.decode("utf-8", errors="replace").splitlines():
+        if line.startswith("run_id:"):
+            return line[len("run_id:") :].strip()
+    return None
+
+
+def _is_redis_error(output: bytes) -> bool:
+    """Check whether redis-cli printed an error reply"""
+    return output.lstrip().startswith((b"ERR", b"NOPERM", b"(error)"))
+
+
+def _parse_redis_config(output: bytes, name: str) -> Optional[str]:
+    """Get a value from redis-cli's reply to CONFIG GET name"""
+    lines = output.decode("utf-8", errors="replace").splitlines()
+    if len(lines) >= 2 and lines[0] == name:
+        return lines[1]
+    return None
 
 
 def _restore_sqlite(params: Dict[str, Any], path: str) -> Dict[str, Any]:
     """Restore SQLite database"""
     try:
-        import shutil
-
         target_db = params["database"]
         target_dir = os.path.dirname(target_db)
 
         # Ensure target directory exists
         os.makedirs(target_dir, exist_ok=True)
 
-        # Copy the restore file to the target location
-        shutil.copy2(path, target_db)
+        # Copy the restore file to the target location in-kernel; the dump's
+        # mode and mtime mean nothing for the restored database
+        copy_file(path, target_db, copy_metadata=False)
+        # Have the kernel pull the database in ahead of its first queries
+        _prefetch_executor.submit(_prefetch_dump, target_db)
 
         return format_success_response(
             f"SQLite restore completed successfully from: {path} to {target_db}",
@@ -448,3 +1154,12 @@ def _restore_sqlite(params: Dict[str, Any], path: str) -> Dict[str, Any]:
         )
     except Exception as e:
         return format_error_response(f"SQLite restore failed: {str(e)}")
+
+
+# Restore handler per database type, built once at import
+_RESTORE_FUNCTIONS: Dict[str, Callable[..., Dict[str, Any]]] = {
+    "postgres": _restore_postgres,
+    "mysql": _restore_mysql,
+    "redis": _restore_redis,
+    "sqlite": _restore_sqlite,
+}
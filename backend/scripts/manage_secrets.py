@@ -53,7 +53,18 @@ def generate_strong_secret(length: int = 32):
     import string
     
     alphabet = string.ascii_letters + string.digits + "!@#$%^&*"
-    return ''.join(secrets.choice(alphabet) for _ in range(length))
+    # Draw random bytes in bulk rather than one urandom call per character;
+    # bytes past the last whole multiple of the alphabet size are rejected
+    # so every character stays equally likely
+    limit = 256 // len(alphabet) * len(alphabet)
+    chars = []
+    while len(chars) < length:
+        for byte in secrets.token_bytes((length - len(chars)) * 2):
+            if byte < limit:
+                chars.append(alphabet[byte % len(alphabet)])
+                if len(chars) == length:
+                    break
+    return ''.join(chars)
 
 
 def main():
@@ -123,6 +134,7 @@ def setup_production_secrets():
         ('API_KEY', 'API authentication key (optional)'),
     ]
     
+    secret_values = {}
     for secret_name, description in secrets_to_setup:
         print(f"\n📝 Setting up {secret_name}: {description}")
         choice = input("Generate random (g) or enter manually (m)? [g/m]: ").strip().lower()
@@ -132,8 +144,12 @@ def setup_production_secrets():
             print(f"Generated: {secret_value[:8]}...")
         else:
             secret_value = input(f"Enter {secret_name}: ").strip()
-        
-        success = secrets_manager.set_secret(secret_name, secret_value, use_aws=use_aws)
+        secret_values[secret_name] = secret_value
+    
+    # Store everything in one go once all values are collected
+    print()
+    results = secrets_manager.set_secrets(secret_values, use_aws=use_aws)
+    for secret_name, success in results.items():
         if success:
             print(f"✅ {secret_name} set successfully")
         else:
@@ -0,0 +1,209 @@
+import errno
+import os
+import signal
+import sqlite3
+import subprocess
+
+import pytest
+
+from app.services import dump_service
+
+
+def test_failed_dump_keeps_the_previous_file(tmp_path):
+    path = tmp_path / "db.sql"
+    path.write_bytes(b"previous dump")
+
+    result = dump_service._run_host_command_to_file(
+        ["sh", "-c", "echo partial; exit 1"], str(path)
+    )
+
+    assert result.returncode == 1
+    assert path.read_bytes() == b"previous dump"
+    assert [entry.name for entry in tmp_path.iterdir()] == ["db.sql"]
+
+
+def test_successful_dump_replaces_the_previous_file(tmp_path):
+    path = tmp_path / "db.sql"
+    path.write_bytes(b"previous dump")
+
+    result = dump_service._run_host_command_to_file(
+        ["sh", "-c", "echo fresh"], str(path)
+    )
+
+    assert result.returncode == 0
+    assert path.read_bytes() == b"fresh\n"
+    assert [entry.name for entry in tmp_path.iterdir()] == ["db.sql"]
+
+
+def _fake_pg_dump(returncode):
+    def run_host_command(cmd, env=None, capture_stdout=True, timeout=None):
+        target = cmd[cmd.index("-f") + 1]
+        with open(target, "wb") as f:
+            f.write(b"new dump")
+        return subprocess.CompletedProcess(cmd, returncode, None, "pg_dump: error")
+
+    return run_host_command
+
+
+POSTGRES_PARAMS = {"database": "app", "username": "app", "password": "secret"}
+
+
+def test_failed_pg_dump_keeps_the_previous_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(dump_service, "run_host_command", _fake_pg_dump(1))
+    path = tmp_path / "app.sql"
+    path.write_bytes(b"previous dump")
+
+    result = dump_service._dump_postgres(POSTGRES_PARAMS, str(path))
+
+    assert result["success"] is False
+    assert path.read_bytes() == b"previous dump"
+    assert [entry.name for entry in tmp_path.iterdir()] == ["app.sql"]
+
+
+def test_pg_dump_file_is_renamed_into_place(tmp_path, monkeypatch):
+    monkeypatch.setattr(dump_service, "run_host_command", _fake_pg_dump(0))
+    path = tmp_path / "app.dump"
+    path.write_bytes(b"previous dump")
+
+    params = {**POSTGRES_PARAMS, "dump_format": "custom"}
+    result = dump_service._dump_postgres(params, str(path))
+
+    assert result["success"] is True
+    assert path.read_bytes() == b"new dump"
+    assert [entry.name for entry in tmp_path.iterdir()] == ["app.dump"]
+
+
+def _fake_directory_pg_dump(returncode):
+    def run_host_command(cmd, env=None, capture_stdout=True, timeout=None):
+        target = cmd[cmd.index("-f") + 1]
+        os.mkdir(target)
+        with open(os.path.join(target, "toc.dat"), "wb") as f:
+            f.write(b"new toc")
+        return subprocess.CompletedProcess(cmd, returncode, None, "pg_dump: error")
+
+    return run_host_command
+
+
+def _previous_directory_dump(tmp_path):
+    path = tmp_path / "app"
+    path.mkdir()
+    (path / "toc.dat").write_bytes(b"previous toc")
+    return path
+
+
+def test_failed_directory_dump_keeps_the_previous_dump(tmp_path, monkeypatch):
+    monkeypatch.setattr(dump_service, "_postgres_table_count", lambda *args: 4)
+    monkeypatch.setattr(dump_service, "run_host_command", _fake_directory_pg_dump(1))
+    path = _previous_directory_dump(tmp_path)
+
+    params = {**POSTGRES_PARAMS, "dump_format": "directory"}
+    result = dump_service._dump_postgres(params, str(path))
+
+    assert result["success"] is False
+    assert (path / "toc.dat").read_bytes() == b"previous toc"
+    assert [entry.name for entry in tmp_path.iterdir()] == ["app"]
+
+
+def test_directory_dump_is_swapped_into_place(tmp_path, monkeypatch):
+    monkeypatch.setattr(dump_service, "_postgres_table_count", lambda *args: 4)
+    monkeypatch.setattr(dump_service, "run_host_command", _fake_directory_pg_dump(0))
+    path = _previous_directory_dump(tmp_path)
+
+    params = {**POSTGRES_PARAMS, "dump_format": "directory"}
+    result = dump_service._dump_postgres(params, str(path))
+
+    assert result["success"] is True
+    assert (path / "toc.dat").read_bytes() == b"new toc"
+    assert [entry.name for entry in tmp_path.iterdir()] == ["app"]
+
+
+class _FailingOutput:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def write(self, data):
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+
+def test_relay_failure_kills_the_dump(tmp_path, monkeypatch):
+    pytest.importorskip("zstandard")
+    monkeypatch.setattr(dump_service, "open_dump_output", lambda path: _FailingOutput())
+    procs = []
+    popen = subprocess.Popen
+
+    def spy(*args, **kwargs):
+        proc = popen(*args, **kwargs)
+        procs.append(proc)
+        return proc
+
+    monkeypatch.setattr(subprocess, "Popen", spy)
+
+    # Without the kill, yes would sit blocked on its full stdout pipe
+    with pytest.raises(OSError):
+        dump_service._run_host_command_to_file(
+            ["yes"], str(tmp_path / "db.sql.zst"), compression="zstd"
+        )
+
+    assert procs[0].returncode == -signal.SIGTERM
+
+
+def _sqlite_database(path, value):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE t (value TEXT)")
+    conn.execute("INSERT INTO t VALUES (?)", (value,))
+    conn.commit()
+    conn.close()
+
+
+def test_sqlite_dump_is_a_consistent_copy(tmp_path):
+    source = tmp_path / "app.db"
+    _sqlite_database(source, "live")
+    dumps = tmp_path / "dumps"
+    dumps.mkdir()
+    path = dumps / "app.sqlite"
+    path.write_bytes(b"previous dump")
+
+    result = dump_service._dump_sqlite({"database": str(source)}, str(path))
+
+    assert result["success"] is True
+    conn = sqlite3.connect(path)
+    assert conn.execute("SELECT value FROM t").fetchall() == [("live",)]
+    conn.close()
+    assert [entry.name for entry in dumps.iterdir()] == ["app.sqlite"]
+
+
+def test_failed_sqlite_backup_keeps_the_previous_dump(tmp_path, monkeypatch):
+    source = tmp_path / "app.db"
+    _sqlite_database(source, "live")
+    dumps = tmp_path / "dumps"
+    dumps.mkdir()
+    path = dumps / "app.sqlite"
+    path.write_bytes(b"previous dump")
+
+    def interrupted_backup(source_db, target):
+        with open(target, "wb") as f:
+            f.write(b"half a backup")
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(dump_service, "_backup_sqlite", interrupted_backup)
+
+    result = dump_service._dump_sqlite({"database": str(source)}, str(path))
+
+    assert result["success"] is False
+    assert path.read_bytes() == b"previous dump"
+    assert [entry.name for entry in dumps.iterdir()] == ["app.sqlite"]
+
+
+def test_sqlite_dump_of_a_missing_database(tmp_path):
+    path = tmp_path / "app.sqlite"
+
+    result = dump_service._dump_sqlite(
+        {"database": str(tmp_path / "missing.db")}, str(path)
+    )
+
+    assert result["success"] is False
+    assert "not found" in result["message"]
+    assert list(tmp_path.iterdir()) == []
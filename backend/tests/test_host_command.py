@@ -0,0 +1,56 @@
+import signal
+import subprocess
+
+import pytest
+
+zstandard = pytest.importorskip("zstandard")
+
+from app.services import host_command  # noqa: E402
+
+
+def test_corrupt_zstd_kills_the_client(tmp_path, monkeypatch):
+    rows = b"".join(b"INSERT INTO t VALUES (%d);\n" % i for i in range(200000))
+    data = zstandard.ZstdCompressor(write_checksum=True).compress(rows)
+    # Keep the frame header intact but mangle the compressed blocks
+    corrupt = data[:64] + bytes(b ^ 0xFF for b in data[64:512]) + data[512:]
+    dump = tmp_path / "dump.sql.zst"
+    dump.write_bytes(corrupt)
+    marker = tmp_path / "committed"
+
+    procs = []
+    popen = subprocess.Popen
+
+    def spy(*args, **kwargs):
+        proc = popen(*args, **kwargs)
+        procs.append(proc)
+        return proc
+
+    monkeypatch.setattr(subprocess, "Popen", spy)
+
+    # The client would "commit" once its stdin reaches EOF
+    args = ["sh", "-c", f"cat > /dev/null && touch {marker}"]
+    with pytest.raises(zstandard.ZstdError):
+        host_command.run_host_command_from_file(args, str(dump), compression="zstd")
+
+    assert procs[0].returncode == -signal.SIGTERM
+    assert not marker.exists()
+
+
+def test_plain_file_is_streamed_to_the_client(tmp_path):
+    dump = tmp_path / "dump.sql"
+    dump.write_bytes(b"SELECT 1;\n")
+    out = tmp_path / "out"
+
+    result = host_command.run_host_command_from_file(
+        ["sh", "-c", f"cat > {out}"], str(dump)
+    )
+
+    assert result.returncode == 0
+    assert out.read_bytes() == b"SELECT 1;\n"
+
+
+def test_command_is_killed_after_its_timeout():
+    result = host_command.run_host_command(["sleep", "30"], timeout=0.2)
+
+    assert result.returncode == -signal.SIGTERM
+    assert result.stderr.endswith("Command timed out after 0.2 seconds")
@@ -0,0 +1,139 @@
+import time
+import types
+
+import pytest
+
+from app.services import object_storage
+
+
+class FakeS3Client:
+    def __init__(self, fail_on_part=None):
+        self.fail_on_part = fail_on_part
+        self.parts = {}
+        self.completed = None
+        self.aborted = False
+
+    def create_multipart_upload(self, Bucket, Key):
+        return {"UploadId": "upload-1"}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        if PartNumber == self.fail_on_part:
+            raise ConnectionError("upload failed")
+        self.parts[PartNumber] = Body
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        self.completed = MultipartUpload["Parts"]
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.aborted = True
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    client = FakeS3Client()
+    fake_boto3 = types.SimpleNamespace(client=lambda *args, **kwargs: client)
+    monkeypatch.setattr(object_storage, "AWS_AVAILABLE", True)
+    monkeypatch.setattr(object_storage, "boto3", fake_boto3, raising=False)
+    monkeypatch.setattr(object_storage, "S3_PART_SIZE", 4)
+    monkeypatch.setattr(object_storage, "S3_PARTS_PER_SIZE", 2)
+    return client
+
+
+def test_part_size_grows_as_parts_accumulate(s3):
+    data = bytes(range(100))
+    with object_storage.S3MultipartWriter("s3://bucket/db.sql.zst") as out:
+        for offset in range(0, len(data), 3):
+            out.write(data[offset : offset + 3])
+
+    sizes = [len(s3.parts[number]) for number in sorted(s3.parts)]
+    assert sizes == [4, 4, 8, 8, 16, 16, 32, 12]
+    assert b"".join(s3.parts[number] for number in sorted(s3.parts)) == data
+    assert [part["PartNumber"] for part in s3.completed] == list(range(1, 9))
+
+
+def test_upload_is_rejected_past_the_part_limit(s3, monkeypatch):
+    monkeypatch.setattr(object_storage, "S3_PARTS_PER_SIZE", 1000)
+    monkeypatch.setattr(object_storage, "S3_MAX_PARTS", 3)
+
+    with pytest.raises(RuntimeError):
+        with object_storage.S3MultipartWriter("s3://bucket/db.sql.zst") as out:
+            out.write(bytes(16))
+
+    assert s3.aborted
+    assert s3.completed is None
+
+
+def test_failed_part_aborts_the_upload(s3):
+    s3.fail_on_part = 2
+
+    writer = object_storage.S3MultipartWriter("s3://bucket/db.sql.zst")
+    writer.write(bytes(10))
+    with pytest.raises(ConnectionError):
+        writer.close()
+
+    assert s3.aborted
+    assert s3.completed is None
+
+
+def test_failed_dump_aborts_the_upload(s3):
+    with pytest.raises(OSError):
+        with object_storage.S3MultipartWriter("s3://bucket/db.sql.zst") as out:
+            out.write(bytes(10))
+            raise OSError("dump failed")
+
+    assert s3.aborted
+    assert s3.completed is None
+
+
+def test_empty_upload_completes_with_one_empty_part(s3):
+    with object_storage.S3MultipartWriter("s3://bucket/db.sql.zst"):
+        pass
+
+    assert s3.parts == {1: b""}
+    assert s3.completed == [{"PartNumber": 1, "ETag": "etag-1"}]
+
+
+def test_part_size_is_capped(s3, monkeypatch):
+    monkeypatch.setattr(object_storage, "S3_MAX_PART_SIZE", 16)
+
+    with object_storage.S3MultipartWriter("s3://bucket/db.sql.zst") as out:
+        out.write(bytes(100))
+
+    sizes = [len(s3.parts[number]) for number in sorted(s3.parts)]
+    assert sizes == [4, 4, 8, 8, 16, 16, 16, 16, 12]
+
+
+def test_failed_part_stops_the_dump_early(s3, monkeypatch):
+    monkeypatch.setattr(object_storage, "S3_PARTS_PER_SIZE", 1000)
+    s3.fail_on_part = 2
+
+    writes = 0
+    with pytest.raises(ConnectionError):
+        with object_storage.S3MultipartWriter("s3://bucket/db.sql.zst") as out:
+            for writes in range(1, 5000):
+                out.write(bytes(4))
+                time.sleep(0.001)
+
+    assert writes < 100
+    assert s3.aborted
+    assert s3.completed is None
+
+
+def test_parts_held_in_memory_are_bounded(s3, monkeypatch):
+    monkeypatch.setattr(object_storage, "S3_PARTS_PER_SIZE", 1000)
+    monkeypatch.setattr(object_storage, "S3_MAX_PENDING_BYTES", 8)
+    upload_part = s3.upload_part
+
+    def slow_upload_part(**kwargs):
+        time.sleep(0.005)
+        return upload_part(**kwargs)
+
+    s3.upload_part = slow_upload_part
+
+    with object_storage.S3MultipartWriter("s3://bucket/db.sql.zst") as out:
+        for _ in range(20):
+            out.write(bytes(4))
+            assert sum(not part.done() for part in out._parts) <= 2
+
+    assert len(s3.parts) == 20
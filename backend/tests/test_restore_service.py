@@ -0,0 +1,516 @@
+import asyncio
+import subprocess
+import threading
+import time
+import types
+
+import pytest
+
+from app.services import restore_service
+
+
+def _fake_redis_cli(data_dir, replies):
+    calls = []
+
+    def run_host_command(args, env=None, cwd=None, capture_stdout=True, timeout=None):
+        command = tuple(args[5:])
+        calls.append(command)
+        if command[:2] == ("CONFIG", "GET"):
+            value = str(data_dir) if command[2] == "dir" else "dump.rdb"
+            stdout = f"{command[2]}\n{value}\n".encode()
+        else:
+            stdout = replies[command]
+        return subprocess.CompletedProcess(args, 0, stdout, "")
+
+    return run_host_command, calls
+
+
+@pytest.mark.parametrize("host", ["redis.internal", "10.0.0.5", "host.docker.internal"])
+def test_redis_restore_refuses_servers_that_are_not_local(host, tmp_path, monkeypatch):
+    # The backend host has a directory of the same name as the server's
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (data_dir / "dump.rdb").write_bytes(b"local data")
+    dump = tmp_path / "backup.rdb"
+    dump.write_bytes(b"backup data")
+    fake, calls = _fake_redis_cli(data_dir, {})
+    monkeypatch.setattr(restore_service, "run_host_command", fake)
+
+    result = restore_service._restore_redis({"host": host}, str(dump))
+
+    assert result["success"] is False
+    assert "stack_name" in result["message"]
+    assert calls == []
+    assert (data_dir / "dump.rdb").read_bytes() == b"local data"
+
+
+def test_redis_restore_refuses_when_debug_is_not_allowed(tmp_path, monkeypatch):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (data_dir / "dump.rdb").write_bytes(b"live data")
+    dump = tmp_path / "backup.rdb"
+    dump.write_bytes(b"backup data")
+    fake, calls = _fake_redis_cli(
+        data_dir,
+        {("DEBUG", "HELP"): b"ERR DEBUG command not allowed.\n"},
+    )
+    monkeypatch.setattr(restore_service, "run_host_command", fake)
+
+    result = restore_service._restore_redis({"host": "localhost"}, str(dump))
+
+    assert result["success"] is False
+    assert "DEBUG" in result["message"]
+    assert (data_dir / "dump.rdb").read_bytes() == b"live data"
+    assert ("DEBUG", "RELOAD", "NOSAVE") not in calls
+
+
+def test_redis_restore_reports_a_decoded_reload_error(tmp_path, monkeypatch):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    dump = tmp_path / "backup.rdb"
+    dump.write_bytes(b"backup data")
+    fake, _ = _fake_redis_cli(
+        data_dir,
+        {
+            ("DEBUG", "HELP"): b"DEBUG <subcommand> [<arg> ...]\n",
+            ("DEBUG", "RELOAD", "NOSAVE"): b"ERR Error trying to load the RDB\n",
+        },
+    )
+    monkeypatch.setattr(restore_service, "run_host_command", fake)
+
+    result = restore_service._restore_redis({"host": "localhost"}, str(dump))
+
+    assert result["success"] is False
+    assert result["message"] == (
+        "Redis restore failed: ERR Error trying to load the RDB"
+    )
+    assert (data_dir / "dump.rdb").read_bytes() == b"backup data"
+
+
+def test_batch_runs_sqlite_restores_into_one_directory_in_turn(monkeypatch):
+    running = {}
+    overlaps = []
+
+    async def fake_restore(**job):
+        directory = job["params"]["database"].rsplit("/", 1)[0]
+        if running.get(directory):
+            overlaps.append(directory)
+        running[directory] = True
+        await asyncio.sleep(0.01)
+        running[directory] = False
+        return {"success": True, "message": job["config_name"]}
+
+    monkeypatch.setattr(restore_service, "run_restore_async", fake_restore)
+    jobs = [
+        {
+            "db_type": "sqlite",
+            "params": {"database": database},
+            "config_name": f"job-{index}",
+        }
+        for index, database in enumerate(
+            ["/data/a/one.db", "/data/b/two.db", "/data/a/three.db"]
+        )
+    ]
+
+    results = asyncio.run(restore_service.run_restores_batch(jobs))
+
+    assert [result["message"] for result in results] == ["job-0", "job-1", "job-2"]
+    assert overlaps == []
+
+
+def test_identical_restore_joins_without_taking_a_slot(monkeypatch):
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def fake_run_restore(*arguments):
+        calls.append(arguments)
+        started.set()
+        release.wait(5)
+        return {"success": True, "message": "restored"}
+
+    monkeypatch.setattr(restore_service, "_run_restore", fake_run_restore)
+    # A single slot: a second caller queueing for it would only run after
+    # the first restore finished, and then restore all over again
+    monkeypatch.setattr(restore_service, "_restore_semaphore", asyncio.Semaphore(1))
+    job = {
+        "db_type": "postgres",
+        "params": {"database": "app"},
+        "config_name": "app",
+        "restore_password": "secret",
+    }
+
+    async def restore_twice():
+        first = asyncio.create_task(restore_service.run_restore_async(**job))
+        await asyncio.to_thread(started.wait, 5)
+        keys = list(restore_service._inflight_restores)
+        second = asyncio.create_task(restore_service.run_restore_async(**job))
+        await asyncio.sleep(0.05)
+        release.set()
+        return keys, await asyncio.gather(first, second)
+
+    keys, results = asyncio.run(restore_twice())
+
+    assert len(calls) == 1
+    assert results == [{"success": True, "message": "restored"}] * 2
+    assert len(keys) == 1 and "secret" not in keys[0]
+
+
+class FakeConnectionPool:
+    def __init__(self, minconn, maxconn, **connect_kwargs):
+        if connect_kwargs["host"] == "unreachable":
+            time.sleep(0.5)
+        if connect_kwargs["password"] == "wrong":
+            raise restore_service.psycopg2.OperationalError("authentication failed")
+        self.connect_kwargs = connect_kwargs
+
+    def closeall(self):
+        pass
+
+
+def test_admin_pools_are_keyed_without_the_password(monkeypatch):
+    pytest.importorskip("psycopg2")
+    monkeypatch.setattr(
+        restore_service.psycopg2.pool, "ThreadedConnectionPool", FakeConnectionPool
+    )
+    monkeypatch.setattr(restore_service, "_admin_pools", {})
+
+    pool = restore_service._get_admin_pool("db", "5432", "admin", "secret")
+    assert restore_service._get_admin_pool("db", "5432", "admin", "secret") is pool
+    assert list(restore_service._admin_pools) == [("db", "5432", "admin")]
+
+    # A wrong password is never handed the authenticated pool
+    with pytest.raises(restore_service.psycopg2.OperationalError):
+        restore_service._get_admin_pool("db", "5432", "admin", "wrong")
+    assert restore_service._get_admin_pool("db", "5432", "admin", "secret") is pool
+
+    # A changed password replaces the pool
+    rotated = restore_service._get_admin_pool("db", "5432", "admin", "rotated")
+    assert rotated is not pool
+    assert rotated.connect_kwargs["password"] == "rotated"
+
+
+class FakeRedisContainer:
+    def __init__(self, appendonly="no", shutdown_reply=b"", restarts=True):
+        self.appendonly = appendonly
+        self.shutdown_reply = shutdown_reply
+        self.restarts = restarts
+        self.run_id = "old-run"
+        self.status = "running"
+        self.archives = []
+
+    def exec_run(self, cmd, environment=None):
+        command = tuple(cmd[1:])
+        if command[:2] == ("CONFIG", "GET"):
+            value = {"dir": "/data", "dbfilename": "dump.rdb"}.get(
+                command[2], self.appendonly
+            )
+            return 0, f"{command[2]}\n{value}\n".encode()
+        if command == ("INFO", "server"):
+            return 0, f"# Server\r\nrun_id:{self.run_id}\r\n".encode()
+        if command == ("SHUTDOWN", "NOSAVE"):
+            if self.shutdown_reply:
+                return 0, self.shutdown_reply
+            self.status = "exited"
+            return 0, b""
+        raise AssertionError(command)
+
+    def put_archive(self, path, data):
+        self.archives.append(path)
+        return True
+
+    def wait(self, condition=None, timeout=None):
+        pass
+
+    def reload(self):
+        pass
+
+    def start(self):
+        self.status = "running"
+        if self.restarts:
+            self.run_id = "new-run"
+
+
+@pytest.fixture
+def redis_container(monkeypatch, tmp_path):
+    def use(container):
+        monkeypatch.setattr(
+            restore_service, "_get_stack_container", lambda stack: "redis-1"
+        )
+        client = types.SimpleNamespace(
+            containers=types.SimpleNamespace(get=lambda container_id: container)
+        )
+        monkeypatch.setattr(restore_service, "get_docker_client", lambda: client)
+        monkeypatch.setattr(restore_service.time, "sleep", lambda seconds: None)
+        dump = tmp_path / "backup.rdb"
+        dump.write_bytes(b"backup data")
+        return restore_service._restore_redis({}, str(dump), stack_name="stack")
+
+    return use
+
+
+def test_container_redis_restore_restarts_the_server(redis_container):
+    container = FakeRedisContainer()
+
+    result = redis_container(container)
+
+    assert result["success"] is True
+    assert container.archives == ["/data"]
+    assert container.run_id == "new-run"
+
+
+def test_container_redis_restore_refuses_appendonly(redis_container):
+    container = FakeRedisContainer(appendonly="yes")
+
+    result = redis_container(container)
+
+    assert result["success"] is False
+    assert "appendonly" in result["message"]
+    assert container.archives == []
+
+
+def test_container_redis_restore_reports_a_refused_shutdown(redis_container):
+    container = FakeRedisContainer(
+        shutdown_reply=b"NOPERM this user has no permissions"
+    )
+
+    result = redis_container(container)
+
+    assert result["success"] is False
+    assert "SHUTDOWN was refused: NOPERM" in result["message"]
+
+
+def test_container_redis_restore_requires_a_new_server(redis_container):
+    container = FakeRedisContainer(restarts=False)
+
+    result = redis_container(container)
+
+    assert result["success"] is False
+    assert "did not restart" in result["message"]
+
+
+PG_PARAMS = {
+    "host": "db",
+    "port": 5432,
+    "database": "app",
+    "username": "admin",
+    "password": "secret",
+}
+PG_CONNECTION = ["-h", "db", "-p", "5432", "-U", "admin"]
+
+
+@pytest.fixture
+def pg_commands(monkeypatch):
+    calls = []
+
+    def run_host_command(args, env=None, cwd=None, capture_stdout=True, timeout=None):
+        calls.append(("command", args))
+        return subprocess.CompletedProcess(args, 0, None, "")
+
+    def run_host_command_from_file(
+        args, path, env=None, compression=None, timeout=None
+    ):
+        calls.append(("stdin", args))
+        return subprocess.CompletedProcess(args, 0, None, "")
+
+    def run_postgres_statements(host, port, username, password, database, statements):
+        calls.append(("statements", database, statements))
+        return subprocess.CompletedProcess(statements, 0, None, "")
+
+    monkeypatch.setattr(restore_service, "run_host_command", run_host_command)
+    monkeypatch.setattr(
+        restore_service, "run_host_command_from_file", run_host_command_from_file
+    )
+    monkeypatch.setattr(
+        restore_service, "_run_postgres_statements", run_postgres_statements
+    )
+    monkeypatch.setattr(restore_service, "PSYCOPG2_AVAILABLE", True)
+    return calls
+
+
+@pytest.fixture
+def pg_archive(tmp_path):
+    path = tmp_path / "app.dump"
+    path.write_bytes(b"PGDMP archive")
+    return str(path)
+
+
+RESETS = {
+    "drop": (
+        "postgres",
+        ['DROP DATABASE IF EXISTS "app" WITH (FORCE)', 'CREATE DATABASE "app"'],
+    ),
+    "truncate": ("app", [restore_service._TRUNCATE_ALL_TABLES]),
+}
+
+
+@pytest.mark.parametrize("reset_mode", ["drop", "truncate", "skip"])
+def test_archive_restore_commands_per_reset_mode(reset_mode, pg_commands, pg_archive):
+    result = restore_service._restore_postgres(
+        PG_PARAMS, pg_archive, reset_mode=reset_mode
+    )
+
+    assert result["success"] is True
+    data_only = ["--data-only"] if reset_mode == "truncate" else []
+    restore = ["pg_restore", *PG_CONNECTION, "-d", "app", "--single-transaction"]
+    restore += ["--no-owner", "--exit-on-error", *data_only, pg_archive]
+    reset = [("statements", *RESETS[reset_mode])] if reset_mode in RESETS else []
+    assert pg_commands[:-1] == [*reset, ("command", restore)]
+    assert pg_commands[-1][1][-2:] == ["-c", "ANALYZE"]
+
+
+@pytest.mark.parametrize("reset_mode", ["drop", "truncate", "skip"])
+def test_plain_restore_commands_per_reset_mode(reset_mode, pg_commands, tmp_path):
+    path = tmp_path / "app.sql"
+    path.write_bytes(b"SELECT 1;\n")
+
+    result = restore_service._restore_postgres(
+        PG_PARAMS, str(path), reset_mode=reset_mode
+    )
+
+    assert result["success"] is True
+    reset = [("statements", *RESETS[reset_mode])] if reset_mode in RESETS else []
+    session = ["psql", *PG_CONNECTION, "-d", "app", "-v", "ON_ERROR_STOP=1"]
+    session += ["-c", "\\unset ON_ERROR_STOP", "-f", "-"]
+    assert pg_commands[:-1] == [*reset, ("stdin", session)]
+
+
+def test_stack_archive_restore_with_truncate_loads_data_only(
+    pg_commands, pg_archive, monkeypatch
+):
+    monkeypatch.setattr(restore_service, "_get_stack_container", lambda stack: "pg-1")
+
+    result = restore_service._restore_postgres(
+        PG_PARAMS, pg_archive, stack_name="stack", reset_mode="truncate"
+    )
+
+    assert result["success"] is True
+    kind, args = pg_commands[0]
+    assert kind == "stdin"
+    assert args[:8] == [
+        "docker",
+        "exec",
+        "-e",
+        "PGPASSWORD",
+        "-e",
+        "PGOPTIONS",
+        "-i",
+        "pg-1",
+    ]
+    script = args[-1]
+    assert "TRUNCATE TABLE" in script
+    assert script.endswith(
+        "exec pg_restore -h db -p 5432 -U admin -d app --no-owner "
+        "--exit-on-error --data-only --single-transaction"
+    )
+
+
+def test_admin_pool_connects_outside_the_lock(monkeypatch):
+    pytest.importorskip("psycopg2")
+    monkeypatch.setattr(
+        restore_service.psycopg2.pool, "ThreadedConnectionPool", FakeConnectionPool
+    )
+    monkeypatch.setattr(restore_service, "_admin_pools", {})
+
+    slow = threading.Thread(
+        target=restore_service._get_admin_pool,
+        args=("unreachable", "5432", "admin", "secret"),
+    )
+    slow.start()
+    time.sleep(0.05)
+    started = time.monotonic()
+    pool = restore_service._get_admin_pool("db", "5432", "admin", "secret")
+    elapsed = time.monotonic() - started
+    slow.join()
+
+    # A slow server doesn't hold up pools for the others
+    assert elapsed < 0.25
+    assert pool.connect_kwargs["connect_timeout"] == 10
+
+
+def test_failed_host_docker_internal_lookup_is_retried(monkeypatch):
+    lookups = []
+
+    def gethostbyname(name):
+        lookups.append(name)
+        if len(lookups) == 1:
+            raise OSError("temporary failure in name resolution")
+        return "172.17.0.1"
+
+    monkeypatch.setattr(restore_service.socket, "gethostbyname", gethostbyname)
+    monkeypatch.setattr(restore_service, "_host_docker_internal_found", False)
+    monkeypatch.setattr(restore_service, "_host_docker_internal_retry_at", 0.0)
+    now = [1000.0]
+    monkeypatch.setattr(restore_service.time, "monotonic", lambda: now[0])
+
+    assert restore_service._host_docker_internal_resolves() is False
+    # The failure is trusted for a while without another lookup
+    assert restore_service._host_docker_internal_resolves() is False
+    assert len(lookups) == 1
+
+    now[0] += restore_service._HOST_LOOKUP_RETRY
+    assert restore_service._host_docker_internal_resolves() is True
+    # A success is kept for good
+    assert restore_service._host_docker_internal_resolves() is True
+    assert len(lookups) == 2
+
+
+def test_mongodb_restore_is_rejected_before_any_preparation(monkeypatch):
+    def unexpected(*args, **kwargs):
+        raise AssertionError("MongoDB restores must not be prepared")
+
+    monkeypatch.setattr(restore_service, "ensure_restore_directory_exists", unexpected)
+    monkeypatch.setattr(restore_service, "_prepare_restore_params", unexpected)
+
+    result = restore_service.run_restore(
+        "mongodb", {"uri": "mongodb://db"}, "app", "secret"
+    )
+
+    assert result == {
+        "success": False,
+        "message": restore_service._UNSUPPORTED_RESTORES["mongodb"],
+    }
+    assert restore_service._inflight_restores == {}
+
+
+def test_unknown_restore_type_is_rejected(monkeypatch):
+    monkeypatch.setattr(
+        restore_service,
+        "ensure_restore_directory_exists",
+        lambda: pytest.fail("unknown types must not be prepared"),
+    )
+
+    result = restore_service.run_restore("oracle", {}, "app", "secret")
+
+    assert result["success"] is False
+    assert result["message"] == "Unsupported database type: oracle"
+
+
+def test_identical_restores_in_threads_share_one_run(monkeypatch):
+    calls = []
+    release = threading.Event()
+
+    def fake_run_restore(*arguments):
+        calls.append(arguments)
+        release.wait(5)
+        return {"success": True, "message": "restored"}
+
+    monkeypatch.setattr(restore_service, "_run_restore", fake_run_restore)
+    job = ("sqlite", {"database": "/data/app.db"}, "app", None)
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(restore_service.run_restore(*job))
+        )
+        for _ in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{"success": True, "message": "restored"}] * 2
+    assert restore_service._inflight_restores == {}
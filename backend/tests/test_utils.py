@@ -0,0 +1,107 @@
+import errno
+import os
+
+import pytest
+
+from app.core import utils
+
+# Bytes each faked in-kernel call copies before the next one fails
+CHUNK = 100_000
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "source.db"
+    path.write_bytes(os.urandom(3 * 1024 * 1024 + 123))
+    return path
+
+
+def _unsupported(error):
+    def call(*args):
+        raise OSError(error, os.strerror(error))
+
+    return call
+
+
+def test_copy_file_is_byte_identical(source, tmp_path):
+    target = tmp_path / "target.db"
+
+    utils.copy_file(str(source), str(target))
+
+    assert target.read_bytes() == source.read_bytes()
+
+
+def test_copy_file_falls_back_to_sendfile(source, tmp_path, monkeypatch):
+    monkeypatch.setattr(os, "copy_file_range", _unsupported(errno.EXDEV), raising=False)
+    target = tmp_path / "target.db"
+
+    utils.copy_file(str(source), str(target))
+
+    assert target.read_bytes() == source.read_bytes()
+
+
+def test_copy_file_falls_back_to_a_buffered_copy(source, tmp_path, monkeypatch):
+    monkeypatch.setattr(os, "copy_file_range", _unsupported(errno.EXDEV), raising=False)
+    monkeypatch.setattr(os, "sendfile", _unsupported(errno.EINVAL))
+    target = tmp_path / "target.db"
+
+    utils.copy_file(str(source), str(target))
+
+    assert target.read_bytes() == source.read_bytes()
+
+
+def test_copy_file_hands_off_mid_stream(source, tmp_path, monkeypatch):
+    calls = []
+    real_sendfile = os.sendfile
+
+    # Each method copies one chunk, then fails as if the filesystem pair
+    # stopped supporting it, so every fallback resumes from an offset
+    def copy_file_range(src, dst, count, offset_src, offset_dst):
+        calls.append("copy_file_range")
+        if calls.count("copy_file_range") > 1:
+            raise OSError(errno.EXDEV, os.strerror(errno.EXDEV))
+        return os.pwrite(dst, os.pread(src, CHUNK, offset_src), offset_dst)
+
+    def sendfile(out_fd, in_fd, offset, count):
+        calls.append("sendfile")
+        if calls.count("sendfile") > 1:
+            raise OSError(errno.EINVAL, os.strerror(errno.EINVAL))
+        return real_sendfile(out_fd, in_fd, offset, CHUNK)
+
+    monkeypatch.setattr(os, "copy_file_range", copy_file_range, raising=False)
+    monkeypatch.setattr(os, "sendfile", sendfile)
+    target = tmp_path / "target.db"
+    # A longer stale target must not leave trailing bytes behind
+    target.write_bytes(b"x" * (4 * 1024 * 1024))
+
+    utils.copy_file(str(source), str(target))
+
+    assert calls == ["copy_file_range", "copy_file_range", "sendfile", "sendfile"]
+    assert target.read_bytes() == source.read_bytes()
+
+
+def test_copy_file_copies_metadata(source, tmp_path):
+    os.chmod(source, 0o600)
+    os.utime(source, (1_000_000_000, 1_000_000_000))
+    target = tmp_path / "target.db"
+
+    utils.copy_file(str(source), str(target))
+
+    assert os.stat(target).st_mode & 0o777 == 0o600
+    assert os.stat(target).st_mtime == 1_000_000_000
+
+
+def test_dump_directory_fallback_is_not_cached(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils, "_dump_directory", None)
+    monkeypatch.setattr(utils.Path, "home", lambda: tmp_path / "home")
+    # A regular file where the mount should be makes the configured path fail
+    mount = tmp_path / "mnt"
+    mount.write_text("not mounted")
+    monkeypatch.setattr(utils.settings, "DUMP_BASE_PATH", str(mount / "dumps"))
+
+    assert utils.get_dump_directory() == "/tmp"
+    assert utils._dump_directory is None
+
+    mount.unlink()
+    assert utils.get_dump_directory() == str(mount / "dumps")
+    assert utils._dump_directory == str(mount / "dumps")